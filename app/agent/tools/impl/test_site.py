@@ -1,6 +1,6 @@
 """测试站点连通性工具"""
 
-from typing import Optional, Type
+from typing import Optional, Type, TypedDict, Unpack
 
 from pydantic import BaseModel, Field
 
@@ -17,6 +17,12 @@ class TestSiteInput(BaseModel):
     site_identifier: str = Field(..., description="Site identifier: can be site ID (integer as string), site name, or site domain/URL")
 
 
+class TestSiteArgs(TypedDict, total=False):
+    """测试站点连通性工具的运行参数（仅用于内部调用，避免重复的Pydantic校验）"""
+    explanation: str
+    site_identifier: str
+
+
 class TestSiteTool(MoviePilotTool):
     name: str = "test_site"
     description: str = "Test site connectivity and availability. This will check if a site is accessible and can be logged in. Accepts site ID, site name, or site domain/URL as identifier."
@@ -27,7 +33,13 @@ class TestSiteTool(MoviePilotTool):
         site_identifier = kwargs.get("site_identifier", "")
         return f"正在测试站点连通性: {site_identifier}"
 
-    async def run(self, site_identifier: str, **kwargs) -> str:
+    async def run(self, **kwargs: Unpack[TestSiteArgs]) -> str:
+        # 参数已在LLM侧由args_schema校验，这里只校验实际使用的字段
+        site_identifier = kwargs.get("site_identifier")
+        if isinstance(site_identifier, int):
+            site_identifier = str(site_identifier)
+        if not isinstance(site_identifier, str) or not site_identifier:
+            return "错误：必须提供站点标识（站点ID、名称或域名）"
         logger.info(f"执行工具: {self.name}, 参数: site_identifier={site_identifier}")
 
         try:
@@ -1,5 +1,6 @@
 """整理文件或目录工具"""
 
+from itertools import islice
 from pathlib import Path
 from typing import Optional, Type
 
@@ -117,7 +118,7 @@ class TransferFileTool(MoviePilotTool):
                 if isinstance(errormsg, list):
                     error_text = f"整理完成，{len(errormsg)} 个文件转移失败"
                     if errormsg:
-                        error_text += f"：\n" + "\n".join(str(e) for e in errormsg[:5])  # 只显示前5个错误
+                        error_text += "：\n" + "\n".join(map(str, islice(errormsg, 5)))  # 只显示前5个错误
                         if len(errormsg) > 5:
                             error_text += f"\n... 还有 {len(errormsg) - 5} 个错误"
                 else:
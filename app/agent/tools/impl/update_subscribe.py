@@ -1,9 +1,9 @@
 """更新订阅工具"""
 
-import json
 from typing import Optional, Type, List
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, Field, ValidationError, model_validator
 
 from app.agent.tools.base import MoviePilotTool
 from app.core.event import eventmanager
@@ -13,6 +13,31 @@ from app.log import logger
 from app.schemas.types import EventType
 
 
+# 提示消息中展示的更新字段：(参数名, 标签, 是否展示)
+_FIELD_LABELS = (
+    ("name", "名称", bool),
+    ("total_episode", "总集数", lambda v: v is not None),
+    ("lack_episode", "缺失集数", lambda v: v is not None),
+    ("quality", "质量过滤", bool),
+    ("resolution", "分辨率过滤", bool),
+    ("state", "状态", bool),
+    ("sites", "站点", bool),
+    ("downloader", "下载器", bool),
+)
+
+# 有效的订阅状态，按文档顺序用于提示信息
+_VALID_STATES = ("R", "P", "S", "N")
+# 有效订阅状态集合，用于校验
+_VALID_STATE_SET = frozenset(_VALID_STATES)
+
+# 未提供任何更新字段时的返回结果
+_NO_FIELDS_MESSAGE = "没有提供要更新的字段"
+_NO_FIELDS_ERROR = orjson.dumps({"success": False, "message": _NO_FIELDS_MESSAGE}).decode()
+
+# 订阅状态显示名称
+_STATE_LABELS = {"R": "启用", "P": "禁用", "S": "暂停"}
+
+
 class UpdateSubscribeInput(BaseModel):
     """更新订阅工具的输入参数模型"""
     explanation: str = Field(..., description="Clear explanation of why this tool is being used in the current context")
@@ -38,87 +63,76 @@ class UpdateSubscribeInput(BaseModel):
     media_category: Optional[str] = Field(None, description="Custom media category (optional)")
     episode_group: Optional[str] = Field(None, description="Episode group ID (optional)")
 
+    @model_validator(mode="after")
+    def check_update_fields(self):
+        """
+        至少需要提供一个有效的更新字段，避免无意义的数据库操作
+        """
+        fields = {key for key, value in self.__dict__.items() if value is not None} - {"explanation", "subscribe_id"}
+        # 未提供总集数时，缺失集数为0不会被更新
+        if self.total_episode is None and (self.lack_episode or 0) <= 0:
+            fields.discard("lack_episode")
+        if not fields:
+            raise ValueError(_NO_FIELDS_MESSAGE)
+        return self
+
 
 class UpdateSubscribeTool(MoviePilotTool):
     name: str = "update_subscribe"
     description: str = "Update subscription properties including filters, episode counts, state, and other settings. Supports updating quality/resolution filters, episode tracking, subscription state, and download configuration."
     args_schema: Type[BaseModel] = UpdateSubscribeInput
+    # 参数校验失败时将错误返回给模型，而不是中断对话
+    handle_validation_error: bool = True
 
     def get_tool_message(self, **kwargs) -> Optional[str]:
         """根据更新参数生成友好的提示消息"""
         subscribe_id = kwargs.get("subscribe_id")
         fields_updated = []
-        
-        if kwargs.get("name"):
-            fields_updated.append("名称")
-        if kwargs.get("total_episode") is not None:
-            fields_updated.append("总集数")
-        if kwargs.get("lack_episode") is not None:
-            fields_updated.append("缺失集数")
-        if kwargs.get("quality"):
-            fields_updated.append("质量过滤")
-        if kwargs.get("resolution"):
-            fields_updated.append("分辨率过滤")
-        if kwargs.get("state"):
-            state_map = {"R": "启用", "P": "禁用", "S": "暂停"}
-            fields_updated.append(f"状态({state_map.get(kwargs.get('state'), kwargs.get('state'))})")
-        if kwargs.get("sites"):
-            fields_updated.append("站点")
-        if kwargs.get("downloader"):
-            fields_updated.append("下载器")
+        for key, label, predicate in _FIELD_LABELS:
+            value = kwargs.get(key)
+            if not predicate(value):
+                continue
+            if key == "state":
+                label = f"{label}({_STATE_LABELS.get(value, value)})"
+            fields_updated.append(label)
         
         if fields_updated:
             return f"正在更新订阅 #{subscribe_id}: {', '.join(fields_updated)}"
         return f"正在更新订阅 #{subscribe_id}"
 
-    async def run(self, subscribe_id: int,
-                  name: Optional[str] = None,
-                  year: Optional[str] = None,
-                  season: Optional[int] = None,
-                  total_episode: Optional[int] = None,
-                  lack_episode: Optional[int] = None,
-                  start_episode: Optional[int] = None,
-                  quality: Optional[str] = None,
-                  resolution: Optional[str] = None,
-                  effect: Optional[str] = None,
-                  include: Optional[str] = None,
-                  exclude: Optional[str] = None,
-                  filter: Optional[str] = None,
-                  state: Optional[str] = None,
-                  sites: Optional[List[int]] = None,
-                  downloader: Optional[str] = None,
-                  save_path: Optional[str] = None,
-                  best_version: Optional[int] = None,
-                  custom_words: Optional[str] = None,
-                  media_category: Optional[str] = None,
-                  episode_group: Optional[str] = None,
-                  **kwargs) -> str:
+    async def run(self, **kwargs) -> str:
+        subscribe_id = kwargs.get("subscribe_id")
         logger.info(f"执行工具: {self.name}, 参数: subscribe_id={subscribe_id}")
         
         try:
+            # 校验参数并一次性导出所有已提供的字段（explanation 仅用于说明，API调用时可缺省）
+            try:
+                input_model = UpdateSubscribeInput.model_validate({"explanation": "", **kwargs})
+            except ValidationError as e:
+                return orjson.dumps({
+                    "success": False,
+                    "message": "; ".join(str(err.get("ctx", {}).get("error") or err["msg"]) for err in e.errors())
+                }).decode()
+            subscribe_dict = input_model.model_dump(exclude_none=True, exclude={"explanation"})
+            # 需要单独处理的字段，剩余字段直接更新
+            subscribe_id = subscribe_dict.pop("subscribe_id")
+            total_episode = subscribe_dict.pop("total_episode", None)
+            lack_episode = subscribe_dict.pop("lack_episode", None)
+            state = subscribe_dict.pop("state", None)
+            
             # 获取数据库会话
             async with AsyncSessionFactory() as db:
                 # 获取订阅
                 subscribe = await Subscribe.async_get(db, subscribe_id)
                 if not subscribe:
-                    return json.dumps({
+                    return orjson.dumps({
                         "success": False,
                         "message": f"订阅不存在: {subscribe_id}"
-                    }, ensure_ascii=False)
-                
-                # 保存旧数据用于事件
-                old_subscribe_dict = subscribe.to_dict()
-                
-                # 构建更新字典
-                subscribe_dict = {}
+                    }).decode()
                 
-                # 基本信息
-                if name is not None:
-                    subscribe_dict["name"] = name
-                if year is not None:
-                    subscribe_dict["year"] = year
-                if season is not None:
-                    subscribe_dict["season"] = season
+                # 保存旧数据用于事件，没有事件处理器时无需序列化
+                has_listener = eventmanager.check(EventType.SubscribeModified)
+                old_subscribe_dict = subscribe.to_dict() if has_listener else None
                 
                 # 集数相关
                 if total_episode is not None:
@@ -137,103 +151,63 @@ class UpdateSubscribeTool(MoviePilotTool):
                         subscribe_dict["lack_episode"] = lack_episode
                     # 如果 lack_episode 为 0，不添加到更新字典中（保持原值或由总集数逻辑处理）
                 
-                if start_episode is not None:
-                    subscribe_dict["start_episode"] = start_episode
-                
-                # 过滤规则
-                if quality is not None:
-                    subscribe_dict["quality"] = quality
-                if resolution is not None:
-                    subscribe_dict["resolution"] = resolution
-                if effect is not None:
-                    subscribe_dict["effect"] = effect
-                if include is not None:
-                    subscribe_dict["include"] = include
-                if exclude is not None:
-                    subscribe_dict["exclude"] = exclude
-                if filter is not None:
-                    subscribe_dict["filter"] = filter
-                
                 # 状态
                 if state is not None:
-                    valid_states = ["R", "P", "S", "N"]
-                    if state not in valid_states:
-                        return json.dumps({
+                    if state not in _VALID_STATE_SET:
+                        return orjson.dumps({
                             "success": False,
-                            "message": f"无效的订阅状态: {state}，有效状态: {', '.join(valid_states)}"
-                        }, ensure_ascii=False)
+                            "message": f"无效的订阅状态: {state}，有效状态: {', '.join(_VALID_STATES)}"
+                        }).decode()
                     subscribe_dict["state"] = state
                 
-                # 下载配置
-                if sites is not None:
-                    subscribe_dict["sites"] = sites
-                if downloader is not None:
-                    subscribe_dict["downloader"] = downloader
-                if save_path is not None:
-                    subscribe_dict["save_path"] = save_path
-                if best_version is not None:
-                    subscribe_dict["best_version"] = best_version
-                
-                # 其他配置
-                if custom_words is not None:
-                    subscribe_dict["custom_words"] = custom_words
-                if media_category is not None:
-                    subscribe_dict["media_category"] = media_category
-                if episode_group is not None:
-                    subscribe_dict["episode_group"] = episode_group
-                
                 # 如果没有要更新的字段
                 if not subscribe_dict:
-                    return json.dumps({
-                        "success": False,
-                        "message": "没有提供要更新的字段"
-                    }, ensure_ascii=False)
+                    return _NO_FIELDS_ERROR
                 
                 # 更新订阅
                 await subscribe.async_update(db, subscribe_dict)
                 
-                # 重新获取更新后的订阅数据
-                updated_subscribe = await Subscribe.async_get(db, subscribe_id)
+                # 提交后属性已过期，原地刷新即可，无需再次按ID查询
+                await db.refresh(subscribe)
                 
-                # 发送订阅调整事件
-                await eventmanager.async_send_event(EventType.SubscribeModified, {
-                    "subscribe_id": subscribe_id,
-                    "old_subscribe_info": old_subscribe_dict,
-                    "subscribe_info": updated_subscribe.to_dict() if updated_subscribe else {},
-                })
+                # 发送订阅调整事件（广播事件只入队，由事件线程处理，无需等待）
+                if has_listener:
+                    eventmanager.send_event(EventType.SubscribeModified, {
+                        "subscribe_id": subscribe_id,
+                        "old_subscribe_info": old_subscribe_dict,
+                        "subscribe_info": subscribe.to_dict(),
+                    })
                 
                 # 构建返回结果
                 result = {
                     "success": True,
                     "message": f"订阅 #{subscribe_id} 更新成功",
                     "subscribe_id": subscribe_id,
-                    "updated_fields": list(subscribe_dict.keys())
-                }
-                
-                if updated_subscribe:
-                    result["subscribe"] = {
-                        "id": updated_subscribe.id,
-                        "name": updated_subscribe.name,
-                        "year": updated_subscribe.year,
-                        "type": updated_subscribe.type,
-                        "season": updated_subscribe.season,
-                        "state": updated_subscribe.state,
-                        "total_episode": updated_subscribe.total_episode,
-                        "lack_episode": updated_subscribe.lack_episode,
-                        "start_episode": updated_subscribe.start_episode,
-                        "quality": updated_subscribe.quality,
-                        "resolution": updated_subscribe.resolution,
-                        "effect": updated_subscribe.effect
+                    "updated_fields": list(subscribe_dict.keys()),
+                    "subscribe": {
+                        "id": subscribe.id,
+                        "name": subscribe.name,
+                        "year": subscribe.year,
+                        "type": subscribe.type,
+                        "season": subscribe.season,
+                        "state": subscribe.state,
+                        "total_episode": subscribe.total_episode,
+                        "lack_episode": subscribe.lack_episode,
+                        "start_episode": subscribe.start_episode,
+                        "quality": subscribe.quality,
+                        "resolution": subscribe.resolution,
+                        "effect": subscribe.effect
                     }
+                }
                 
-                return json.dumps(result, ensure_ascii=False, indent=2)
+                return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
         
         except Exception as e:
             error_message = f"更新订阅失败: {str(e)}"
             logger.error(f"更新订阅失败: {e}", exc_info=True)
-            return json.dumps({
+            return orjson.dumps({
                 "success": False,
                 "message": error_message,
                 "subscribe_id": subscribe_id
-            }, ensure_ascii=False)
+            }).decode()
 
@@ -1,16 +1,136 @@
-import json
+import sys
 import uuid
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
 
 from app.agent.tools.factory import MoviePilotToolFactory
 from app.log import logger
 
 
+# 视为 True 的字符串参数
+_TRUE_STRINGS = frozenset({"true", "1", "yes", "on"})
+
+
+def _to_int(key: str, value: Any) -> Any:
+    """
+    字符串参数转换为整数
+    """
+    if type(value) is not str:
+        return value
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        logger.warning(f"无法将参数 {key}='{value}' 转换为整数，保持原值")
+        return None
+
+
+def _to_float(key: str, value: Any) -> Any:
+    """
+    字符串参数转换为浮点数
+    """
+    if type(value) is not str:
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        logger.warning(f"无法将参数 {key}='{value}' 转换为浮点数，保持原值")
+        return None
+
+
+def _to_bool(key: str, value: Any) -> bool:
+    """
+    参数转换为布尔值
+    """
+    if type(value) is bool:
+        return value
+    if type(value) is str:
+        return value.lower() in _TRUE_STRINGS
+    if isinstance(value, (int, float)):
+        return value != 0
+    return True
+
+
+_COERCIONS: Dict[str, Callable[[str, Any], Any]] = {
+    "integer": _to_int,
+    "number": _to_float,
+    "boolean": _to_bool,
+}
+
+
+@lru_cache(maxsize=None)
+def _schema_for(args_schema: Any) -> Tuple[Dict[str, Any], Tuple[Tuple[str, Callable[[str, Any], Any]], ...]]:
+    """
+    计算并缓存Pydantic模型对应的JSON Schema及字段类型转换表
+
+    Args:
+        args_schema: Pydantic模型类
+
+    Returns:
+        (JSON Schema字典, ((字段名, 类型转换函数), ...))
+    """
+    # 获取Pydantic模型的字段信息
+    schema = args_schema.model_json_schema()
+    schema_required = schema.get("required", [])
+
+    # 构建JSON Schema
+    properties = {}
+    required = []
+    coercions = []
+
+    for field_name, field_info in schema.get("properties", {}).items():
+        field_name = sys.intern(field_name)
+
+        # 转换字段类型
+        field_type = field_info.get("type", "string")
+        field_description = field_info.get("description", "")
+        properties[field_name] = {
+            "type": field_type,
+            "description": field_description
+        }
+
+        # 处理可选字段
+        if field_name not in schema_required:
+            default_value = field_info.get("default")
+            if default_value is not None:
+                properties[field_name]["default"] = default_value
+        else:
+            required.append(field_name)
+
+        # 处理枚举类型
+        if "enum" in field_info:
+            properties[field_name]["enum"] = field_info["enum"]
+
+        # 处理数组类型
+        if field_type == "array" and "items" in field_info:
+            properties[field_name]["items"] = field_info["items"]
+
+        # 处理 anyOf 类型（例如 Optional[int] 会生成 anyOf），提取实际类型用于参数转换
+        coerce_type = field_info.get("type")
+        if not coerce_type:
+            for type_option in field_info.get("anyOf") or []:
+                if "type" in type_option and type_option["type"] != "null":
+                    coerce_type = type_option["type"]
+                    break
+        coerce = _COERCIONS.get(coerce_type)
+        if coerce:
+            coercions.append((field_name, coerce))
+
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": required
+    }, tuple(coercions)
+
+
 class ToolDefinition:
     """
     工具定义
     """
 
+    __slots__ = ("name", "description", "input_schema")
+
     def __init__(self, name: str, description: str, input_schema: Dict[str, Any]):
         self.name = name
         self.description = description
@@ -22,17 +142,21 @@ class MoviePilotToolsManager:
     MoviePilot工具管理器（用于HTTP API）
     """
 
-    def __init__(self, user_id: str = "api_user", session_id: str = uuid.uuid4()):
+    def __init__(self, user_id: str = "api_user", session_id: Optional[str] = None):
         """
         初始化工具管理器
         
         Args:
             user_id: 用户ID
-            session_id: 会话ID
+            session_id: 会话ID，未指定时随机生成
         """
         self.user_id = user_id
-        self.session_id = session_id
+        self.session_id = session_id or str(uuid.uuid4())
         self.tools: List[Any] = []
+        self._tools_by_name: Dict[str, Any] = {}
+        self._tool_definitions: List[ToolDefinition] = []
+        self._mcp_tools: List[Dict[str, Any]] = []
+        self._mcp_tools_by_name: Dict[str, Dict[str, Any]] = {}
         self._load_tools()
 
     def _load_tools(self):
@@ -53,13 +177,53 @@ class MoviePilotToolsManager:
         except Exception as e:
             logger.error(f"加载工具失败: {e}", exc_info=True)
             self.tools = []
+        # 建立名称索引并预生成工具定义
+        self._tools_by_name = {tool.name: tool for tool in self.tools}
+        self._tool_definitions = self._build_tool_definitions()
+        # 预生成 MCP 格式的工具列表及名称索引，随工具加载一同更新
+        self._mcp_tools = [
+            {
+                "name": definition.name,
+                "description": definition.description,
+                "inputSchema": definition.input_schema
+            }
+            for definition in self._tool_definitions
+        ]
+        self._mcp_tools_by_name = {tool["name"]: tool for tool in self._mcp_tools}
 
     def list_tools(self) -> List[ToolDefinition]:
         """
         列出所有可用的工具
         
         Returns:
-            工具定义列表
+            工具定义列表（预生成，调用方只读）
+        """
+        return self._tool_definitions
+
+    def list_mcp_tools(self) -> List[Dict[str, Any]]:
+        """
+        列出 MCP 格式的工具定义
+
+        Returns:
+            MCP 格式的工具列表（预生成，调用方只读）
+        """
+        return self._mcp_tools
+
+    def get_mcp_tool(self, tool_name: str) -> Optional[Dict[str, Any]]:
+        """
+        按名称获取 MCP 格式的工具定义
+
+        Args:
+            tool_name: 工具名称
+
+        Returns:
+            MCP 格式的工具定义，如果未找到返回None
+        """
+        return self._mcp_tools_by_name.get(tool_name)
+
+    def _build_tool_definitions(self) -> List[ToolDefinition]:
+        """
+        生成所有工具的定义
         """
         tools_list = []
         for tool in self.tools:
@@ -94,10 +258,7 @@ class MoviePilotToolsManager:
         Returns:
             工具实例，如果未找到返回None
         """
-        for tool in self.tools:
-            if tool.name == tool_name:
-                return tool
-        return None
+        return self._tools_by_name.get(tool_name)
 
     @staticmethod
     def _normalize_arguments(tool_instance: Any, arguments: Dict[str, Any]) -> Dict[str, Any]:
@@ -111,61 +272,27 @@ class MoviePilotToolsManager:
         Returns:
             规范化后的参数
         """
+        # 无参数时无需规范化
+        if not arguments:
+            return {}
+
         # 获取工具的参数schema
         args_schema = getattr(tool_instance, 'args_schema', None)
         if not args_schema:
             return arguments
 
-        # 获取schema中的字段定义
+        # 获取缓存的字段类型转换表
         try:
-            schema = args_schema.model_json_schema()
-            properties = schema.get("properties", {})
+            _, coercions = _schema_for(args_schema)
         except Exception as e:
             logger.warning(f"获取工具schema失败: {e}")
             return arguments
 
-        # 规范化参数
-        normalized = {}
-        for key, value in arguments.items():
-            if key not in properties:
-                # 参数不在schema中，保持原样
-                normalized[key] = value
-                continue
-
-            field_info = properties[key]
-            field_type = field_info.get("type")
-
-            # 处理 anyOf 类型（例如 Optional[int] 会生成 anyOf）
-            any_of = field_info.get("anyOf")
-            if any_of and not field_type:
-                # 从 anyOf 中提取实际类型
-                for type_option in any_of:
-                    if "type" in type_option and type_option["type"] != "null":
-                        field_type = type_option["type"]
-                        break
-
-            # 根据类型进行转换
-            if field_type == "integer" and isinstance(value, str):
-                try:
-                    normalized[key] = int(value)
-                except (ValueError, TypeError):
-                    logger.warning(f"无法将参数 {key}='{value}' 转换为整数，保持原值")
-                    normalized[key] = None
-            elif field_type == "number" and isinstance(value, str):
-                try:
-                    normalized[key] = float(value)
-                except (ValueError, TypeError):
-                    logger.warning(f"无法将参数 {key}='{value}' 转换为浮点数，保持原值")
-                    normalized[key] = None
-            elif field_type == "boolean":
-                if isinstance(value, str):
-                    normalized[key] = value.lower() in ("true", "1", "yes", "on")
-                elif isinstance(value, (int, float)):
-                    normalized[key] = value != 0
-                else:
-                    normalized[key] = True
-            else:
-                normalized[key] = value
+        # 规范化参数，仅处理需要类型转换的字段
+        normalized = dict(arguments)
+        for key, coerce in coercions:
+            if key in normalized:
+                normalized[key] = coerce(key, normalized[key])
 
         return normalized
 
@@ -183,9 +310,9 @@ class MoviePilotToolsManager:
         tool_instance = self.get_tool(tool_name)
 
         if not tool_instance:
-            error_msg = json.dumps({
+            error_msg = orjson.dumps({
                 "error": f"工具 '{tool_name}' 未找到"
-            }, ensure_ascii=False)
+            }).decode()
             return error_msg
 
         try:
@@ -198,27 +325,26 @@ class MoviePilotToolsManager:
             # 确保返回字符串
             if isinstance(result, str):
                 formated_result = result
-            elif isinstance(result, int, float):
+            elif isinstance(result, (int, float)):
                 formated_result = str(result)
             else:
-                try:
-                    formated_result = json.dumps(result, ensure_ascii=False, indent=2)
-                except Exception as e:
-                    logger.warning(f"结果转换为JSON失败: {e}, 使用字符串表示")
-                    formated_result = str(result)
+                # 无法序列化的对象直接使用字符串表示
+                formated_result = orjson.dumps(
+                    result, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                ).decode()
 
             return formated_result
         except Exception as e:
             logger.error(f"调用工具 {tool_name} 时发生错误: {e}", exc_info=True)
-            error_msg = json.dumps({
+            error_msg = orjson.dumps({
                 "error": f"调用工具 '{tool_name}' 时发生错误: {str(e)}"
-            }, ensure_ascii=False)
+            }).decode()
             return error_msg
 
     @staticmethod
     def _convert_to_json_schema(args_schema: Any) -> Dict[str, Any]:
         """
-        将Pydantic模型转换为JSON Schema
+        将Pydantic模型转换为JSON Schema（结果按模型类缓存，调用方只读）
         
         Args:
             args_schema: Pydantic模型类
@@ -226,49 +352,7 @@ class MoviePilotToolsManager:
         Returns:
             JSON Schema字典
         """
-        # 获取Pydantic模型的字段信息
-        schema = args_schema.model_json_schema()
-
-        # 构建JSON Schema
-        properties = {}
-        required = []
-
-        if "properties" in schema:
-            for field_name, field_info in schema["properties"].items():
-                # 转换字段类型
-                field_type = field_info.get("type", "string")
-                field_description = field_info.get("description", "")
-
-                # 处理可选字段
-                if field_name not in schema.get("required", []):
-                    # 可选字段
-                    default_value = field_info.get("default")
-                    properties[field_name] = {
-                        "type": field_type,
-                        "description": field_description
-                    }
-                    if default_value is not None:
-                        properties[field_name]["default"] = default_value
-                else:
-                    properties[field_name] = {
-                        "type": field_type,
-                        "description": field_description
-                    }
-                    required.append(field_name)
-
-                # 处理枚举类型
-                if "enum" in field_info:
-                    properties[field_name]["enum"] = field_info["enum"]
-
-                # 处理数组类型
-                if field_type == "array" and "items" in field_info:
-                    properties[field_name]["items"] = field_info["items"]
-
-        return {
-            "type": "object",
-            "properties": properties,
-            "required": required
-        }
-
+        input_schema, _ = _schema_for(args_schema)
+        return input_schema
 
 moviepilot_tool_manager = MoviePilotToolsManager()
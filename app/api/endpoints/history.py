@@ -1,26 +1,41 @@
-from typing import List, Any, Optional
+import asyncio
+from functools import lru_cache
+from typing import Any, Optional
 
-import jieba
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
 from pathlib import Path
 
 from app import schemas
 from app.chain.storage import StorageChain
 from app.core.event import eventmanager
 from app.core.security import verify_token
-from app.db import get_async_db, get_db
+from app.db import get_async_db
 from app.db.models import User
 from app.db.models.downloadhistory import DownloadHistory, DownloadFiles
 from app.db.models.transferhistory import TransferHistory
-from app.db.user_oper import get_current_active_superuser_async, get_current_active_superuser
+from app.db.user_oper import get_current_active_superuser_async
 from app.schemas.types import EventType
 
 router = APIRouter()
 
 
-@router.get("/download", summary="查询下载历史记录", response_model=List[schemas.DownloadHistory])
+@lru_cache(maxsize=4096)
+def _title_pattern(title: str) -> str:
+    """
+    对标题分词并生成模糊查询模式，相同标题的分词结果直接复用
+    """
+    # 纯ASCII标题无需中文分词，按空白切分即可
+    if title.isascii():
+        return "%".join(title.split())
+    # 仅在需要分词时才导入jieba，避免启动时加载
+    import jieba
+    return "%".join(jieba.cut(title, HMM=False))
+
+
+@router.get("/download", summary="查询下载历史记录", response_class=ORJSONResponse)
 async def download_history(page: Optional[int] = 1,
                            count: Optional[int] = 30,
                            db: AsyncSession = Depends(get_async_db),
@@ -28,7 +43,8 @@ async def download_history(page: Optional[int] = 1,
     """
     查询下载历史记录
     """
-    return await DownloadHistory.async_list_by_page(db, page, count)
+    # 按列查询字典列表，直接序列化返回
+    return ORJSONResponse(await DownloadHistory.async_list_by_page(db, page, count, as_dict=True))
 
 
 @router.delete("/download", summary="删除下载历史记录", response_model=schemas.Response)
@@ -42,7 +58,8 @@ async def delete_download_history(history_in: schemas.DownloadHistory,
     return schemas.Response(success=True)
 
 
-@router.get("/transfer", summary="查询整理记录", response_model=schemas.Response)
+@router.get("/transfer", summary="查询整理记录", response_model=schemas.Response,
+            response_class=ORJSONResponse)
 async def transfer_history(title: Optional[str] = None,
                            page: Optional[int] = 1,
                            count: Optional[int] = 30,
@@ -59,58 +76,68 @@ async def transfer_history(title: Optional[str] = None,
         title = None
         status = True
 
+    # 总数查询不传入会话，由装饰器创建独立会话，与列表查询并发执行
     if title:
-        words = jieba.cut(title, HMM=False)
-        title = "%".join(words)
-        total = await TransferHistory.async_count_by_title(db, title=title, status=status)
-        result = await TransferHistory.async_list_by_title(db, title=title, page=page,
-                                                           count=count, status=status)
+        title = _title_pattern(title)
+        total, result = await asyncio.gather(
+            TransferHistory.async_count_by_title(db=None, title=title, status=status),
+            TransferHistory.async_list_by_title(db, title=title, page=page, count=count, status=status,
+                                                as_dict=True)
+        )
     else:
-        result = await TransferHistory.async_list_by_page(db, page=page, count=count, status=status)
-        total = await TransferHistory.async_count(db, status=status)
+        total, result = await asyncio.gather(
+            TransferHistory.async_count(db=None, status=status),
+            TransferHistory.async_list_by_page(db, page=page, count=count, status=status, as_dict=True)
+        )
 
-    return schemas.Response(success=True,
-                            data={
-                                "list": [item.to_dict() for item in result],
-                                "total": total,
-                            })
+    # 列表已是字典，直接序列化返回，跳过响应模型的二次校验
+    return ORJSONResponse({
+        "success": True,
+        "message": None,
+        "data": {
+            "list": result,
+            "total": total,
+        }
+    })
 
 
 @router.delete("/transfer", summary="删除整理记录", response_model=schemas.Response)
-def delete_transfer_history(history_in: schemas.TransferHistory,
-                            deletesrc: Optional[bool] = False,
-                            deletedest: Optional[bool] = False,
-                            db: Session = Depends(get_db),
-                            _: User = Depends(get_current_active_superuser)) -> Any:
+async def delete_transfer_history(history_in: schemas.TransferHistory,
+                                  deletesrc: Optional[bool] = False,
+                                  deletedest: Optional[bool] = False,
+                                  db: AsyncSession = Depends(get_async_db),
+                                  _: User = Depends(get_current_active_superuser_async)) -> Any:
     """
     删除整理记录
     """
-    history: TransferHistory = TransferHistory.get(db, history_in.id)
+    history: TransferHistory = await TransferHistory.async_get(db, history_in.id)
     if not history:
         return schemas.Response(success=False, message="记录不存在")
+    # 提交后记录属性会过期，提前取出事件所需字段
+    src, download_hash = history.src, history.download_hash
     # 册除媒体库文件
     if deletedest and history.dest_fileitem:
         dest_fileitem = schemas.FileItem(**history.dest_fileitem)
-        StorageChain().delete_media_file(dest_fileitem)
+        await run_in_threadpool(StorageChain().delete_media_file, dest_fileitem)
 
     # 删除源文件
     if deletesrc and history.src_fileitem:
         src_fileitem = schemas.FileItem(**history.src_fileitem)
-        state = StorageChain().delete_media_file(src_fileitem)
+        state = await run_in_threadpool(StorageChain().delete_media_file, src_fileitem)
         if not state:
             return schemas.Response(success=False, message=f"{src_fileitem.path} 删除失败")
         # 删除下载记录中关联的文件
-        DownloadFiles.delete_by_fullpath(db, Path(src_fileitem.path).as_posix())
+        await DownloadFiles.async_delete_by_fullpath(db, Path(src_fileitem.path).as_posix())
         # 发送事件
         eventmanager.send_event(
             EventType.DownloadFileDeleted,
             {
-                "src": history.src,
-                "hash": history.download_hash
+                "src": src,
+                "hash": download_hash
             }
         )
     # 删除记录
-    TransferHistory.delete(db, history_in.id)
+    await TransferHistory.async_delete(db, history_in.id)
     return schemas.Response(success=True)
 
 
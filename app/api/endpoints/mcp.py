@@ -1,7 +1,9 @@
-from typing import List, Any, Dict, Annotated, Union
+import asyncio
+from typing import List, Any, Dict, Annotated, Union, Optional, Callable, Awaitable, Tuple
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import ORJSONResponse, Response
 
 from app import schemas
 from app.agent.tools.manager import moviepilot_tool_manager
@@ -20,6 +22,36 @@ router = APIRouter()
 MCP_PROTOCOL_VERSIONS = ["2025-11-25", "2025-06-18", "2024-11-05"]
 MCP_PROTOCOL_VERSION = MCP_PROTOCOL_VERSIONS[0]  # 默认使用最新版本
 
+# 初始化响应模板，仅协议版本随请求变化
+MCP_INITIALIZE_RESULT: Dict[str, Any] = {
+    "protocolVersion": MCP_PROTOCOL_VERSION,
+    "capabilities": {
+        "tools": {
+            "listChanged": False  # 暂不支持工具列表变更通知
+        },
+        "logging": {}
+    },
+    "serverInfo": {
+        "name": "MoviePilot",
+        "version": APP_VERSION,
+        "description": "MoviePilot MCP Server - 电影自动化管理工具",
+    },
+    "instructions": "MoviePilot MCP 服务器，提供媒体管理、订阅、下载等工具。"
+}
+
+def validate_jsonrpc_request(body: Any) -> Optional[Tuple[int, str]]:
+    """
+    校验 JSON-RPC 请求结构，校验失败时返回错误码和错误信息
+    """
+    if not isinstance(body, dict) \
+            or body.get("jsonrpc") != "2.0" \
+            or not isinstance(body.get("method"), str):
+        return -32600, "Invalid Request"
+    params = body.get("params")
+    if params is not None and not isinstance(params, dict):
+        return -32602, "Invalid params"
+    return None
+
 
 def create_jsonrpc_response(request_id: Union[str, int, None], result: Any) -> Dict[str, Any]:
     """
@@ -51,87 +83,89 @@ def create_jsonrpc_error(request_id: Union[str, int, None], code: int, message:
     return error
 
 
-@router.post("", summary="MCP JSON-RPC 端点", response_model=None)
+@router.post("", summary="MCP JSON-RPC 端点", response_model=None, response_class=ORJSONResponse)
 async def mcp_jsonrpc(
         request: Request,
         _: Annotated[str, Depends(verify_apikey)] = None
-) -> Union[JSONResponse, Response]:
+) -> Union[ORJSONResponse, Response]:
     """
     MCP 标准 JSON-RPC 2.0 端点
     
-    处理所有 MCP 协议消息（初始化、工具列表、工具调用等）
+    处理所有 MCP 协议消息（初始化、工具列表、工具调用等），支持批量请求
     """
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
     except Exception as e:
         logger.error(f"解析请求体失败: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=400,
             content=create_jsonrpc_error(None, -32700, "Parse error", str(e))
         )
 
+    # 批量请求，并发处理各子请求
+    if isinstance(body, list):
+        if not body:
+            return ORJSONResponse(
+                status_code=400,
+                content=create_jsonrpc_error(None, -32600, "Invalid Request")
+            )
+        results = await asyncio.gather(*(dispatch_jsonrpc(item) for item in body))
+        # 通知类请求不返回响应
+        contents = [content for _, content in results if content is not None]
+        if not contents:
+            return Response(status_code=204)
+        return ORJSONResponse(content=contents)
+
+    status_code, content = await dispatch_jsonrpc(body)
+    if content is None:
+        return Response(status_code=204)
+    return ORJSONResponse(status_code=status_code, content=content)
+
+
+async def dispatch_jsonrpc(body: Any) -> Tuple[int, Optional[Dict[str, Any]]]:
+    """
+    处理单个 JSON-RPC 请求，返回 HTTP 状态码和响应内容，无需响应时内容为 None
+    """
     # 验证 JSON-RPC 格式
-    if not isinstance(body, dict) or body.get("jsonrpc") != "2.0":
-        return JSONResponse(
-            status_code=400,
-            content=create_jsonrpc_error(body.get("id"), -32600, "Invalid Request")
-        )
+    error = validate_jsonrpc_request(body)
+    if error:
+        return 400, create_jsonrpc_error(body.get("id") if isinstance(body, dict) else None, *error)
 
-    method = body.get("method")
-    params = body.get("params", {})
+    method = body["method"]
+    params = body.get("params") or {}
     request_id = body.get("id")
 
     # 如果有 id，则为请求；没有 id 则为通知
     is_notification = request_id is None
 
     try:
-        # 处理初始化请求
-        if method == "initialize":
-            result = await handle_initialize(params)
-            return JSONResponse(content=create_jsonrpc_response(request_id, result))
-
         # 处理已初始化通知
-        elif method == "notifications/initialized":
+        if method == "notifications/initialized":
             if is_notification:
-                return Response(status_code=204)
+                return 204, None
             else:
-                return JSONResponse(
-                    status_code=400,
-                    content={"error": "initialized must be a notification"}
-                )
-
-        # 处理工具列表请求
-        if method == "tools/list":
-            result = await handle_tools_list()
-            return JSONResponse(content=create_jsonrpc_response(request_id, result))
-
-        # 处理工具调用请求
-        elif method == "tools/call":
-            result = await handle_tools_call(params)
-            return JSONResponse(content=create_jsonrpc_response(request_id, result))
-
-        # 处理 ping 请求
-        elif method == "ping":
-            return JSONResponse(content=create_jsonrpc_response(request_id, {}))
-
-        # 未知方法
+                return 400, {"error": "initialized must be a notification"}
+
+        # 按方法名查找处理函数
+        handler = MCP_METHOD_HANDLERS.get(method)
+        if not handler:
+            # 未知方法
+            status_code, content = 200, create_jsonrpc_error(request_id, -32601, f"Method not found: {method}")
         else:
-            return JSONResponse(
-                content=create_jsonrpc_error(request_id, -32601, f"Method not found: {method}")
-            )
+            result = await handler(params)
+            status_code, content = 200, create_jsonrpc_response(request_id, result)
 
     except ValueError as e:
         logger.warning(f"MCP 请求参数错误: {e}")
-        return JSONResponse(
-            status_code=400,
-            content=create_jsonrpc_error(request_id, -32602, "Invalid params", str(e))
-        )
+        status_code, content = 400, create_jsonrpc_error(request_id, -32602, "Invalid params", str(e))
     except Exception as e:
         logger.error(f"处理 MCP 请求失败: {e}", exc_info=True)
-        return JSONResponse(
-            status_code=500,
-            content=create_jsonrpc_error(request_id, -32603, "Internal error", str(e))
-        )
+        status_code, content = 500, create_jsonrpc_error(request_id, -32603, "Internal error", str(e))
+
+    # 通知不返回任何响应，包括未知方法及处理失败
+    if is_notification:
+        return 204, None
+    return status_code, content
 
 
 async def handle_initialize(params: Dict[str, Any]) -> Dict[str, Any]:
@@ -153,41 +187,17 @@ async def handle_initialize(params: Dict[str, Any]) -> Dict[str, Any]:
         # 客户端版本不支持，使用服务器默认版本
         logger.warning(f"协议版本不匹配: 客户端={protocol_version}, 使用服务器版本={negotiated_version}")
 
-    return {
-        "protocolVersion": negotiated_version,
-        "capabilities": {
-            "tools": {
-                "listChanged": False  # 暂不支持工具列表变更通知
-            },
-            "logging": {}
-        },
-        "serverInfo": {
-            "name": "MoviePilot",
-            "version": APP_VERSION,
-            "description": "MoviePilot MCP Server - 电影自动化管理工具",
-        },
-        "instructions": "MoviePilot MCP 服务器，提供媒体管理、订阅、下载等工具。"
-    }
+    result = MCP_INITIALIZE_RESULT.copy()
+    result["protocolVersion"] = negotiated_version
+    return result
 
 
-async def handle_tools_list() -> Dict[str, Any]:
+async def handle_tools_list(_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     处理工具列表请求
     """
-    tools = moviepilot_tool_manager.list_tools()
-
-    # 转换为 MCP 工具格式
-    mcp_tools = []
-    for tool in tools:
-        mcp_tool = {
-            "name": tool.name,
-            "description": tool.description,
-            "inputSchema": tool.input_schema
-        }
-        mcp_tools.append(mcp_tool)
-
     return {
-        "tools": mcp_tools
+        "tools": moviepilot_tool_manager.list_mcp_tools()
     }
 
 
@@ -196,14 +206,12 @@ async def handle_tools_call(params: Dict[str, Any]) -> Dict[str, Any]:
     处理工具调用请求
     """
     tool_name = params.get("name")
-    arguments = params.get("arguments", {})
-
     if not tool_name:
         raise ValueError("Missing tool name")
 
     try:
-        result_text = await moviepilot_tool_manager.call_tool(tool_name, arguments)
-
+        # arguments 可能缺失或为 null
+        result_text = await moviepilot_tool_manager.call_tool(tool_name, params.get("arguments") or {})
         return {
             "content": [
                 {
@@ -225,10 +233,26 @@ async def handle_tools_call(params: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+async def handle_ping(_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    处理 ping 请求
+    """
+    return {}
+
+
+# MCP 方法与处理函数的映射
+MCP_METHOD_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]] = {
+    "initialize": handle_initialize,
+    "tools/list": handle_tools_list,
+    "tools/call": handle_tools_call,
+    "ping": handle_ping,
+}
+
+
 @router.delete("", summary="终止 MCP 会话", response_model=None)
 async def delete_mcp_session(
         _: Annotated[str, Depends(verify_apikey)] = None
-) -> Union[JSONResponse, Response]:
+) -> Union[ORJSONResponse, Response]:
     """
     终止 MCP 会话（无状态模式下仅返回成功）
     """
@@ -237,7 +261,7 @@ async def delete_mcp_session(
 
 # ==================== 兼容的 RESTful API 端点 ====================
 
-@router.get("/tools", summary="列出所有可用工具", response_model=List[Dict[str, Any]])
+@router.get("/tools", summary="列出所有可用工具")
 async def list_tools(
         _: Annotated[str, Depends(verify_apikey)]
 ) -> Any:
@@ -247,20 +271,7 @@ async def list_tools(
     返回每个工具的名称、描述和参数定义
     """
     try:
-        # 获取所有工具定义
-        tools = moviepilot_tool_manager.list_tools()
-
-        # 转换为字典格式
-        tools_list = []
-        for tool in tools:
-            tool_dict = {
-                "name": tool.name,
-                "description": tool.description,
-                "inputSchema": tool.input_schema
-            }
-            tools_list.append(tool_dict)
-
-        return tools_list
+        return moviepilot_tool_manager.list_mcp_tools()
     except Exception as e:
         logger.error(f"获取工具列表失败: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"获取工具列表失败: {str(e)}")
@@ -293,7 +304,7 @@ async def call_tool(
         )
 
 
-@router.get("/tools/{tool_name}", summary="获取工具详情", response_model=Dict[str, Any])
+@router.get("/tools/{tool_name}", summary="获取工具详情")
 async def get_tool_info(
         tool_name: str,
         _: Annotated[str, Depends(verify_apikey)]
@@ -305,17 +316,10 @@ async def get_tool_info(
         工具的详细信息，包括名称、描述和参数定义
     """
     try:
-        # 获取所有工具
-        tools = moviepilot_tool_manager.list_tools()
-
         # 查找指定工具
-        for tool in tools:
-            if tool.name == tool_name:
-                return {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "inputSchema": tool.input_schema
-                }
+        tool = moviepilot_tool_manager.get_mcp_tool(tool_name)
+        if tool:
+            return tool
 
         raise HTTPException(status_code=404, detail=f"工具 '{tool_name}' 未找到")
     except HTTPException:
@@ -325,7 +329,7 @@ async def get_tool_info(
         raise HTTPException(status_code=500, detail=f"获取工具信息失败: {str(e)}")
 
 
-@router.get("/tools/{tool_name}/schema", summary="获取工具参数Schema", response_model=Dict[str, Any])
+@router.get("/tools/{tool_name}/schema", summary="获取工具参数Schema")
 async def get_tool_schema(
         tool_name: str,
         _: Annotated[str, Depends(verify_apikey)]
@@ -337,13 +341,10 @@ async def get_tool_schema(
         工具的JSON Schema定义
     """
     try:
-        # 获取所有工具
-        tools = moviepilot_tool_manager.list_tools()
-
         # 查找指定工具
-        for tool in tools:
-            if tool.name == tool_name:
-                return tool.input_schema
+        tool = moviepilot_tool_manager.get_mcp_tool(tool_name)
+        if tool:
+            return tool["inputSchema"]
 
         raise HTTPException(status_code=404, detail=f"工具 '{tool_name}' 未找到")
     except HTTPException:
@@ -1,18 +1,24 @@
+import asyncio
+import copy
+import heapq
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Any, Union, Annotated, Optional
+from typing import List, Any, Union, Annotated, Optional, Dict, Tuple, Callable
 
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 
 from app import schemas
 from app.chain.media import MediaChain
 from app.chain.tmdb import TmdbChain
+from app.core.cache import cached
 from app.core.config import settings
-from app.core.context import Context
+from app.core.context import Context, MediaInfo
 from app.core.event import eventmanager
 from app.core.metainfo import MetaInfo, MetaInfoPath
 from app.core.security import verify_token, verify_apitoken
 from app.db.models import User
-from app.db.user_oper import get_current_active_user, get_current_active_superuser
+from app.db.user_oper import get_current_active_user_async, get_current_active_superuser_async
 from app.schemas import MediaType, MediaRecognizeConvertEventData
 from app.schemas.category import CategoryConfig
 from app.schemas.types import ChainEventType
@@ -20,6 +26,47 @@ from app.schemas.types import ChainEventType
 router = APIRouter()
 
 
+# 媒体ID前缀与识别参数名、类型的对应关系
+_MEDIAID_PREFIXES: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    "tmdb": ("tmdbid", int),
+    "douban": ("doubanid", str),
+    "bangumi": ("bangumiid", int),
+}
+
+
+def _parse_mediaid(mediaid: str) -> Optional[Tuple[str, Any]]:
+    """
+    解析带来源前缀的媒体ID，返回识别参数名及ID值，无法识别前缀时返回None
+    """
+    prefix, sep, value = mediaid.partition(":")
+    spec = _MEDIAID_PREFIXES.get(prefix) if sep else None
+    if not spec:
+        return None
+    key, caster = spec
+    return key, caster(value)
+
+
+@cached(maxsize=settings.CONF.tmdb, ttl=600)
+async def _recognize_media_by_id(key: str, value: Any, mtype: Optional[MediaType] = None) -> Optional[MediaInfo]:
+    """
+    按媒体ID识别媒体信息，短时间内重复浏览同一媒体时直接复用识别结果
+    缓存的媒体信息为共享对象，调用方不得修改，需要修改时先复制
+    :param key: 识别参数名，如tmdbid、doubanid、bangumiid
+    :param value: 媒体ID
+    :param mtype: 媒体类型
+    """
+    return await MediaChain().async_recognize_media(**{key: value}, mtype=mtype)
+
+
+@lru_cache(maxsize=8)
+def _source_sort_order(search_source: str) -> Dict[str, int]:
+    """
+    解析搜索源配置为排序字典，配置不变时直接复用
+    """
+    setting_order = search_source.split(',') if search_source else []
+    return {source: index for index, source in enumerate(setting_order)}
+
+
 @router.get("/recognize", summary="识别媒体信息（种子）", response_model=schemas.Context)
 async def recognize(title: str,
                     subtitle: Optional[str] = None,
@@ -70,6 +117,43 @@ async def recognize_file2(path: str,
     return await recognize_file(path)
 
 
+def _sort_and_page(result: List[Union[MediaInfo, schemas.MediaPerson]], page: int, count: int) -> List[dict]:
+    """
+    按搜索源优先级排序并分页，仅对当前页的结果转换为字典
+    """
+    if not result:
+        return []
+    sort_order = _source_sort_order(settings.SEARCH_SOURCE or "")
+    # 只取到当前页为止的前N项，无需对全部结果排序
+    top_result = heapq.nsmallest(page * count, result, key=lambda x: sort_order.get(x.source, 4))
+    return [
+        obj.model_dump() if isinstance(obj, schemas.MediaPerson) else obj.to_dict()
+        for obj in top_result[(page - 1) * count:]
+    ]
+
+
+async def _search_medias(media_chain: MediaChain, title: str) -> List[MediaInfo]:
+    """
+    搜索媒体信息
+    """
+    _, medias = await media_chain.async_search(title=title)
+    return medias or []
+
+
+async def _search_collections(media_chain: MediaChain, title: str) -> List[MediaInfo]:
+    """
+    搜索系列合集
+    """
+    return await media_chain.async_search_collections(name=title) or []
+
+
+async def _search_persons(media_chain: MediaChain, title: str) -> List[schemas.MediaPerson]:
+    """
+    搜索人物信息
+    """
+    return await media_chain.async_search_persons(name=title) or []
+
+
 @router.get("/search", summary="搜索媒体/人物信息", response_model=List[dict])
 async def search(title: str,
                  type: Optional[str] = "media",
@@ -79,41 +163,43 @@ async def search(title: str,
     """
     模糊搜索媒体/人物信息列表 media：媒体信息，person：人物信息
     """
-
-    def __get_source(obj: Union[schemas.MediaInfo, schemas.MediaPerson, dict]):
-        """
-        获取对象属性
-        """
-        if isinstance(obj, dict):
-            return obj.get("source")
-        return obj.source
-
     media_chain = MediaChain()
     if type == "media":
-        _, medias = await media_chain.async_search(title=title)
-        result = [media.to_dict() for media in medias] if medias else []
+        result = await _search_medias(media_chain, title)
     elif type == "collection":
-        collections = await media_chain.async_search_collections(name=title)
-        result = [collection.to_dict() for collection in collections] if collections else []
+        result = await _search_collections(media_chain, title)
     else:  # person
-        persons = await media_chain.async_search_persons(name=title)
-        result = [person.model_dump() for person in persons] if persons else []
-
-    if not result:
-        return []
+        result = await _search_persons(media_chain, title)
 
     # 排序和分页
-    setting_order = settings.SEARCH_SOURCE.split(',') if settings.SEARCH_SOURCE else []
-    sort_order = {source: index for index, source in enumerate(setting_order)}
+    return _sort_and_page(result, page, count)
 
-    sorted_result = sorted(result, key=lambda x: sort_order.get(__get_source(x), 4))
-    return sorted_result[(page - 1) * count:page * count]
+
+@router.get("/search_all", summary="同时搜索媒体/合集/人物信息", response_model=Dict[str, List[dict]])
+async def search_all(title: str,
+                     page: int = 1,
+                     count: int = 8,
+                     _: schemas.TokenPayload = Depends(verify_token)) -> Any:
+    """
+    并发搜索媒体、系列合集和人物信息，一次返回三类结果，各自排序分页
+    """
+    media_chain = MediaChain()
+    medias, collections, persons = await asyncio.gather(
+        _search_medias(media_chain, title),
+        _search_collections(media_chain, title),
+        _search_persons(media_chain, title)
+    )
+    return {
+        "media": _sort_and_page(medias, page, count),
+        "collection": _sort_and_page(collections, page, count),
+        "person": _sort_and_page(persons, page, count)
+    }
 
 
 @router.post("/scrape/{storage}", summary="刮削媒体信息", response_model=schemas.Response)
-def scrape(fileitem: schemas.FileItem,
-           storage: Optional[str] = "local",
-           _: schemas.TokenPayload = Depends(verify_token)) -> Any:
+async def scrape(fileitem: schemas.FileItem,
+                 storage: Optional[str] = "local",
+                 _: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
     刮削媒体信息
     """
@@ -123,32 +209,32 @@ def scrape(fileitem: schemas.FileItem,
     # 识别媒体信息
     scrape_path = Path(fileitem.path)
     meta = MetaInfoPath(scrape_path)
-    mediainfo = chain.recognize_by_meta(meta)
+    mediainfo = await chain.async_recognize_by_meta(meta)
     if not mediainfo:
         return schemas.Response(success=False, message="刮削失败，无法识别媒体信息")
     if storage == "local":
         if not scrape_path.exists():
             return schemas.Response(success=False, message="刮削路径不存在")
-    # 手动刮削 (暂时使用同步版本，可以后续优化为异步)
-    chain.scrape_metadata(fileitem=fileitem, meta=meta, mediainfo=mediainfo, overwrite=True)
+    # 手动刮削，刮削涉及文件读写及网络请求，放到线程池中执行
+    await run_in_threadpool(chain.scrape_metadata, fileitem=fileitem, meta=meta, mediainfo=mediainfo, overwrite=True)
     return schemas.Response(success=True, message=f"{fileitem.path} 刮削完成")
 
 
 @router.get("/category/config", summary="获取分类策略配置", response_model=schemas.Response)
-def get_category_config(_: User = Depends(get_current_active_user)):
+async def get_category_config(_: User = Depends(get_current_active_user_async)):
     """
     获取分类策略配置
     """
-    config = MediaChain().category_config()
+    config = await run_in_threadpool(MediaChain().category_config)
     return schemas.Response(success=True, data=config.model_dump())
 
 
 @router.post("/category/config", summary="保存分类策略配置", response_model=schemas.Response)
-def save_category_config(config: CategoryConfig, _: User = Depends(get_current_active_superuser)):
+async def save_category_config(config: CategoryConfig, _: User = Depends(get_current_active_superuser_async)):
     """
     保存分类策略配置
     """
-    if MediaChain().save_category_config(config):
+    if await run_in_threadpool(MediaChain().save_category_config, config):
         return schemas.Response(success=True, message="保存成功")
     else:
         return schemas.Response(success=False, message="保存失败")
@@ -175,10 +261,10 @@ async def groups(tmdbid: int, _: schemas.TokenPayload = Depends(verify_token)) -
     """
     查询媒体剧集组列表（themoviedb）
     """
-    mediainfo = await MediaChain().async_recognize_media(tmdbid=tmdbid, mtype=MediaType.TV)
+    mediainfo = await _recognize_media_by_id("tmdbid", tmdbid, MediaType.TV)
     if not mediainfo:
         return []
-    return mediainfo.episode_groups
+    return copy.deepcopy(mediainfo.episode_groups)
 
 
 @router.get("/seasons", summary="查询媒体季信息", response_model=List[schemas.MediaSeason])
@@ -190,10 +276,11 @@ async def seasons(mediaid: Optional[str] = None,
     """
     查询媒体季信息
     """
-    if mediaid:
-        if mediaid.startswith("tmdb:"):
-            tmdbid = int(mediaid[5:])
-            seasons_info = await TmdbChain().async_tmdb_seasons(tmdbid=tmdbid)
+    parsed = _parse_mediaid(mediaid) if mediaid else None
+    if parsed:
+        key, value = parsed
+        if key == "tmdbid":
+            seasons_info = await TmdbChain().async_tmdb_seasons(tmdbid=value)
             if seasons_info:
                 if season is not None:
                     return [sea for sea in seasons_info if sea.season_number == season]
@@ -233,12 +320,12 @@ async def detail(mediaid: str, type_name: str, title: Optional[str] = None, year
     mtype = MediaType(type_name)
     mediainfo = None
     mediachain = MediaChain()
-    if mediaid.startswith("tmdb:"):
-        mediainfo = await mediachain.async_recognize_media(tmdbid=int(mediaid[5:]), mtype=mtype)
-    elif mediaid.startswith("douban:"):
-        mediainfo = await mediachain.async_recognize_media(doubanid=mediaid[7:], mtype=mtype)
-    elif mediaid.startswith("bangumi:"):
-        mediainfo = await mediachain.async_recognize_media(bangumiid=int(mediaid[8:]), mtype=mtype)
+    parsed = _parse_mediaid(mediaid)
+    if parsed:
+        key, value = parsed
+        mediainfo = await _recognize_media_by_id(key, value, mtype)
+        # 缓存的识别结果为共享对象，补充图片前先复制
+        mediainfo = copy.deepcopy(mediainfo)
     else:
         # 广播事件解析媒体信息
         event_data = MediaRecognizeConvertEventData(
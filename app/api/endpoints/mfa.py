@@ -7,10 +7,13 @@ from typing import Any, Annotated, Optional
 
 from app.helper.sites import SitesHelper
 from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import schemas
 from app.core import security
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.db import get_async_db
 from app.db.models.passkey import PassKey
@@ -26,20 +29,8 @@ router = APIRouter()
 
 # ==================== 辅助函数 ====================
 
-def _build_credential_list(passkeys: list[PassKey]) -> list[dict[str, Any]]:
-    """
-    构建凭证列表
-
-    :param passkeys: PassKey 列表
-    :return: 凭证字典列表
-    """
-    return [
-        {
-            'credential_id': pk.credential_id,
-            'transports': pk.transports
-        }
-        for pk in passkeys
-    ] if passkeys else []
+# 已签发的认证挑战值，超时或使用后失效
+_auth_challenges = TTLCache(region="passkey_challenge", maxsize=1024, ttl=300)
 
 
 def _extract_and_standardize_credential_id(credential: dict) -> str:
@@ -56,28 +47,39 @@ def _extract_and_standardize_credential_id(credential: dict) -> str:
     return PassKeyHelper.standardize_credential_id(credential_id_raw)
 
 
-def _verify_passkey_and_update(
+async def _verify_passkey_and_update(
+    db: AsyncSession,
     credential: dict,
     challenge: str,
     passkey: PassKey
 ) -> tuple[bool, int]:
     """
-    验证 PassKey 并更新使用时间和签名计数
+    验证 PassKey 并更新使用时间和签名计数，更新会提交事务，会话中已加载的对象随之过期
 
+    :param db: 数据库会话
     :param credential: 凭证字典
     :param challenge: 挑战值
     :param passkey: PassKey 对象
     :return: (验证是否成功, 新的签名计数)
     """
-    success, new_sign_count = PassKeyHelper.verify_authentication_response(
+    # 挑战值未签发、已过期或已使用时直接拒绝，避免无谓的签名验证
+    # 以删除结果判定是否取得挑战值，多个进程共享 Redis 缓存时同一挑战值也只能被使用一次
+    if not _auth_challenges.pop(challenge, False):
+        logger.warning("PassKey认证挑战值无效或已过期")
+        return False, passkey.sign_count
+
+    # 签名验证为CPU密集操作，放到线程池中执行避免阻塞事件循环
+    success, new_sign_count = await run_in_threadpool(
+        PassKeyHelper.verify_authentication_response,
         credential=credential,
         expected_challenge=challenge,
         credential_public_key=passkey.public_key,
-        credential_current_sign_count=passkey.sign_count
+        credential_current_sign_count=passkey.sign_count,
+        expected_user_id=passkey.user_id
     )
 
     if success:
-        passkey.update_last_used(db=None, sign_count=new_sign_count)
+        await passkey.async_update_last_used(db, sign_count=new_sign_count)
 
     return success, new_sign_count
 
@@ -116,16 +118,9 @@ async def mfa_status(username: str, db: AsyncSession = Depends(get_async_db)) ->
     """
     检查指定用户是否启用了任何双重验证方式（OTP 或 PassKey）
     """
-    user: User = await User.async_get_by_name(db, username)
-    if not user:
-        return schemas.Response(success=False)
-    
-    # 检查是否启用了OTP
-    has_otp = user.is_otp
-    
-    # 检查是否有PassKey
-    has_passkey = await _check_user_has_passkey(db, user.id)
-    
+    # 一次查询是否启用了OTP及是否有PassKey，用户不存在时均为False
+    has_otp, has_passkey = await User.async_get_mfa_status(db, username)
+
     # 只要有任何一种验证方式，就需要双重验证
     return schemas.Response(success=(has_otp or has_passkey))
 
@@ -202,8 +197,9 @@ class PassKeyAuthenticationFinish(schemas.BaseModel):
 
 
 @router.post("/passkey/register/start", summary="开始注册 PassKey", response_model=schemas.Response)
-def passkey_register_start(
-    current_user: Annotated[User, Depends(get_current_active_user)]
+async def passkey_register_start(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
 ) -> Any:
     """开始注册 PassKey - 生成注册选项"""
     try:
@@ -214,9 +210,8 @@ def passkey_register_start(
                 message="为了确保在域名配置错误时仍能找回访问权限，请先启用 OTP 验证码再注册通行密钥"
             )
 
-        # 获取用户已有的PassKey
-        existing_passkeys = PassKey.get_by_user_id(db=None, user_id=current_user.id)
-        existing_credentials = _build_credential_list(existing_passkeys) if existing_passkeys else None
+        # 获取用户已有的PassKey凭证
+        existing_credentials = await PassKey.async_list_credentials(db=db, user_id=current_user.id) or None
 
         # 生成注册选项
         options_json, challenge = PassKeyHelper.generate_registration_options(
@@ -242,14 +237,18 @@ def passkey_register_start(
 
 
 @router.post("/passkey/register/finish", summary="完成注册 PassKey", response_model=schemas.Response)
-def passkey_register_finish(
+async def passkey_register_finish(
     passkey_req: PassKeyRegistrationFinish,
-    current_user: Annotated[User, Depends(get_current_active_user)]
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
 ) -> Any:
     """完成注册 PassKey - 验证并保存凭证"""
+    # 保存后会话中的用户对象会过期，提前取出用户名
+    username = current_user.name
     try:
         # 验证注册响应
-        credential_id, public_key, sign_count, aaguid = PassKeyHelper.verify_registration_response(
+        credential_id, public_key, sign_count, aaguid = await run_in_threadpool(
+            PassKeyHelper.verify_registration_response,
             credential=passkey_req.credential,
             expected_challenge=passkey_req.challenge
         )
@@ -269,9 +268,9 @@ def passkey_register_finish(
             aaguid=aaguid,
             transports=transports
         )
-        passkey.create()
+        await passkey.async_create(db)
 
-        logger.info(f"用户 {current_user.name} 成功注册PassKey: {passkey_req.name}")
+        logger.info(f"用户 {username} 成功注册PassKey: {passkey_req.name}")
 
         return schemas.Response(
             success=True,
@@ -286,8 +285,9 @@ def passkey_register_finish(
 
 
 @router.post("/passkey/authenticate/start", summary="开始 PassKey 认证", response_model=schemas.Response)
-def passkey_authenticate_start(
-    passkey_req: PassKeyAuthenticationStart = Body(...)
+async def passkey_authenticate_start(
+    passkey_req: PassKeyAuthenticationStart = Body(...),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """开始 PassKey 认证 - 生成认证选项"""
     try:
@@ -295,21 +295,20 @@ def passkey_authenticate_start(
         
         # 如果指定了用户名，只允许该用户的PassKey
         if passkey_req.username:
-            user = User.get_by_name(db=None, name=passkey_req.username)
-            existing_passkeys = PassKey.get_by_user_id(db=None, user_id=user.id) if user else None
+            user = await User.async_get_by_name(db, passkey_req.username)
+            existing_credentials = await PassKey.async_list_credentials(db=db, user_id=user.id) if user else None
 
-            if not user or not existing_passkeys:
+            if not user or not existing_credentials:
                 return schemas.Response(
                     success=False,
                     message="认证失败"
                 )
 
-            existing_credentials = _build_credential_list(existing_passkeys)
-
         # 生成认证选项
         options_json, challenge = PassKeyHelper.generate_authentication_options(
             existing_credentials=existing_credentials
         )
+        _auth_challenges[challenge] = True
 
         return schemas.Response(
             success=True,
@@ -327,8 +326,9 @@ def passkey_authenticate_start(
 
 
 @router.post("/passkey/authenticate/finish", summary="完成 PassKey 认证", response_model=schemas.Token)
-def passkey_authenticate_finish(
-    passkey_req: PassKeyAuthenticationFinish
+async def passkey_authenticate_finish(
+    passkey_req: PassKeyAuthenticationFinish,
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """完成 PassKey 认证 - 验证凭证并返回 token"""
     try:
@@ -339,14 +339,19 @@ def passkey_authenticate_finish(
             logger.warning(f"PassKey认证失败，提供的凭证无效: {e}")
             raise HTTPException(status_code=401, detail="认证失败")
 
-        # 查找PassKey并获取用户
-        passkey = PassKey.get_by_credential_id(db=None, credential_id=credential_id)
-        user = User.get_by_id(db=None, user_id=passkey.user_id) if passkey else None
-        if not passkey or not user or not user.is_active:
+        # 联表查找PassKey及其所属的已激活用户
+        row = await User.async_get_by_passkey(db, credential_id=credential_id)
+        if not row:
             raise HTTPException(status_code=401, detail="认证失败")
+        user, passkey = row
+
+        # 更新使用记录后用户对象会过期，提前取出生成令牌所需的用户信息
+        user_id, user_name, is_superuser = user.id, user.name, user.is_superuser
+        avatar, permissions = user.avatar, user.permissions
 
         # 验证认证响应并更新
-        success, _ = _verify_passkey_and_update(
+        success, _ = await _verify_passkey_and_update(
+            db=db,
             credential=passkey_req.credential,
             challenge=passkey_req.challenge,
             passkey=passkey
@@ -355,7 +360,7 @@ def passkey_authenticate_finish(
         if not success:
             raise HTTPException(status_code=401, detail="认证失败")
 
-        logger.info(f"用户 {user.name} 通过PassKey认证成功")
+        logger.info(f"用户 {user_name} 通过PassKey认证成功")
 
         # 生成token
         level = SitesHelper().auth_level
@@ -363,19 +368,19 @@ def passkey_authenticate_finish(
 
         return schemas.Token(
             access_token=security.create_access_token(
-                userid=user.id,
-                username=user.name,
-                super_user=user.is_superuser,
+                userid=user_id,
+                username=user_name,
+                super_user=is_superuser,
                 expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
                 level=level
             ),
             token_type="bearer",
-            super_user=user.is_superuser,
-            user_id=user.id,
-            user_name=user.name,
-            avatar=user.avatar,
+            super_user=is_superuser,
+            user_id=user_id,
+            user_name=user_name,
+            avatar=avatar,
             level=level,
-            permissions=user.permissions or {},
+            permissions=permissions or {},
             wizard=show_wizard
         )
     except HTTPException:
@@ -385,30 +390,31 @@ def passkey_authenticate_finish(
         raise HTTPException(status_code=401, detail="认证失败")
 
 
-@router.get("/passkey/list", summary="获取当前用户的 PassKey 列表", response_model=schemas.Response)
-def passkey_list(
-    current_user: Annotated[User, Depends(get_current_active_user)]
+@router.get("/passkey/list", summary="获取当前用户的 PassKey 列表", response_class=ORJSONResponse)
+async def passkey_list(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
 ) -> Any:
     """获取当前用户的所有 PassKey"""
     try:
-        passkeys = PassKey.get_by_user_id(db=None, user_id=current_user.id)
-        
-        key_list = [
-            {
-                'id': pk.id,
-                'name': pk.name,
-                'created_at': pk.created_at.isoformat() if pk.created_at else None,
-                'last_used_at': pk.last_used_at.isoformat() if pk.last_used_at else None,
-                'aaguid': pk.aaguid,
-                'transports': pk.transports
-            }
-            for pk in passkeys
-        ] if passkeys else []
-
-        return schemas.Response(
-            success=True,
-            data=key_list
-        )
+        passkeys = await PassKey.async_get_by_user_id(db=db, user_id=current_user.id)
+
+        # 时间字段直接交由 orjson 序列化为 ISO 格式
+        return ORJSONResponse({
+            "success": True,
+            "message": None,
+            "data": [
+                {
+                    'id': pk.id,
+                    'name': pk.name,
+                    'created_at': pk.created_at,
+                    'last_used_at': pk.last_used_at,
+                    'aaguid': pk.aaguid,
+                    'transports': pk.transports
+                }
+                for pk in passkeys or []
+            ]
+        })
     except Exception as e:
         logger.error(f"获取PassKey列表失败: {e}")
         return schemas.Response(
@@ -420,18 +426,21 @@ def passkey_list(
 @router.post("/passkey/delete", summary="删除 PassKey", response_model=schemas.Response)
 async def passkey_delete(
     data: PassKeyDeleteRequest,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user_async)
 ) -> Any:
     """删除指定的 PassKey"""
+    # 删除后会话中的用户对象会过期，提前取出用户名
+    username = current_user.name
     try:
         # 验证密码
         if not security.verify_password(data.password, str(current_user.hashed_password)):
             return schemas.Response(success=False, message="密码错误")
 
-        success = PassKey.delete_by_id(db=None, passkey_id=data.passkey_id, user_id=current_user.id)
+        success = await PassKey.async_delete_by_id(db=db, passkey_id=data.passkey_id, user_id=current_user.id)
         
         if success:
-            logger.info(f"用户 {current_user.name} 删除了PassKey: {data.passkey_id}")
+            logger.info(f"用户 {username} 删除了PassKey: {data.passkey_id}")
             return schemas.Response(
                 success=True,
                 message="通行密钥已删除"
@@ -450,11 +459,14 @@ async def passkey_delete(
 
 
 @router.post("/passkey/verify", summary="PassKey 二次验证", response_model=schemas.Response)
-def passkey_verify_mfa(
+async def passkey_verify_mfa(
     passkey_req: PassKeyAuthenticationFinish,
-    current_user: Annotated[User, Depends(get_current_active_user)]
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
 ) -> Any:
     """使用 PassKey 进行二次验证（MFA）"""
+    # 更新使用记录后会话中的用户对象会过期，提前取出用户信息
+    user_id, username = current_user.id, current_user.name
     try:
         # 提取并标准化凭证ID
         try:
@@ -464,15 +476,16 @@ def passkey_verify_mfa(
             return schemas.Response(success=False, message="验证失败")
 
         # 查找PassKey（必须属于当前用户）
-        passkey = PassKey.get_by_credential_id(db=None, credential_id=credential_id)
-        if not passkey or passkey.user_id != current_user.id:
+        passkey = await PassKey.async_get_by_credential_id(db=db, credential_id=credential_id)
+        if not passkey or passkey.user_id != user_id:
             return schemas.Response(
                 success=False,
                 message="通行密钥不存在或不属于当前用户"
             )
 
         # 验证认证响应并更新
-        success, _ = _verify_passkey_and_update(
+        success, _ = await _verify_passkey_and_update(
+            db=db,
             credential=passkey_req.credential,
             challenge=passkey_req.challenge,
             passkey=passkey
@@ -484,7 +497,7 @@ def passkey_verify_mfa(
                 message="通行密钥验证失败"
             )
 
-        logger.info(f"用户 {current_user.name} 通过PassKey二次验证成功")
+        logger.info(f"用户 {username} 通过PassKey二次验证成功")
 
         return schemas.Response(
             success=True,
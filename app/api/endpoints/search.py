@@ -1,11 +1,14 @@
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Tuple, Dict, Callable, Awaitable
 
+import orjson
 from fastapi import APIRouter, Depends, Body
+from fastapi.responses import ORJSONResponse
 
 from app import schemas
 from app.chain.media import MediaChain
 from app.chain.search import SearchChain
 from app.chain.ai_recommend import AIRecommendChain
+from app.core.context import Context
 from app.core.config import settings
 from app.core.event import eventmanager
 from app.core.metainfo import MetaInfo
@@ -16,6 +19,108 @@ from app.schemas.types import MediaType, ChainEventType
 
 router = APIRouter()
 
+# 媒体类型值映射
+_MEDIA_TYPES = {media_type.value: media_type for media_type in MediaType}
+
+
+def _parse_sites(sites: Optional[str]) -> Optional[List[int]]:
+    """
+    解析逗号分隔的站点ID参数，忽略空项、多余空白及重复ID并保持原顺序，存在非数字ID时抛出ValueError
+    """
+    if not sites:
+        return None
+    return list(dict.fromkeys(int(site) for site in sites.split(",") if site.strip()))
+
+
+def _parse_season(season: Optional[str]) -> Optional[int]:
+    """
+    解析季号参数，为空时返回None，非数字时抛出ValueError
+    """
+    if not season or not season.strip():
+        return None
+    return int(season)
+
+
+def _context_default(obj: Any) -> Any:
+    """
+    orjson 无法直接序列化的对象转换
+    """
+    if isinstance(obj, Context):
+        return obj.to_dict()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError
+
+
+class ContextResponse(ORJSONResponse):
+    """
+    直接序列化搜索结果上下文对象的响应，避免先转换为字典再经模型编码
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_context_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+
+
+async def _resolve_tmdb(media_chain: MediaChain, mediaid: str,
+                        media_type: Optional[MediaType]) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    解析TMDBID，返回搜索使用的媒体ID参数，识别源为豆瓣时转换为豆瓣ID
+    """
+    tmdbid = int(mediaid)
+    if settings.RECOGNIZE_SOURCE == "douban":
+        # 通过TMDBID识别豆瓣ID
+        doubaninfo = await media_chain.async_get_doubaninfo_by_tmdbid(tmdbid=tmdbid, mtype=media_type)
+        if not doubaninfo:
+            return None, "未识别到豆瓣媒体信息"
+        return {"doubanid": doubaninfo.get("id")}, None
+    return {"tmdbid": tmdbid}, None
+
+
+async def _resolve_douban(media_chain: MediaChain, mediaid: str,
+                          media_type: Optional[MediaType]) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    解析豆瓣ID，返回搜索使用的媒体ID参数，识别源为TMDB时转换为TMDBID
+    """
+    if settings.RECOGNIZE_SOURCE == "themoviedb":
+        # 通过豆瓣ID识别TMDBID
+        tmdbinfo = await media_chain.async_get_tmdbinfo_by_doubanid(doubanid=mediaid, mtype=media_type)
+        if not tmdbinfo:
+            return None, "未识别到TMDB媒体信息"
+        return {"tmdbid": tmdbinfo.get("id"), "season": tmdbinfo.get("season")}, None
+    return {"doubanid": mediaid}, None
+
+
+async def _resolve_bangumi(media_chain: MediaChain, mediaid: str,
+                           media_type: Optional[MediaType]) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    解析BangumiID，按识别源转换为TMDBID或豆瓣ID
+    """
+    bangumiid = int(mediaid)
+    if settings.RECOGNIZE_SOURCE == "themoviedb":
+        # 通过BangumiID识别TMDBID
+        tmdbinfo = await media_chain.async_get_tmdbinfo_by_bangumiid(bangumiid=bangumiid)
+        if not tmdbinfo:
+            return None, "未识别到TMDB媒体信息"
+        return {"tmdbid": tmdbinfo.get("id")}, None
+    # 通过BangumiID识别豆瓣ID
+    doubaninfo = await media_chain.async_get_doubaninfo_by_bangumiid(bangumiid=bangumiid)
+    if not doubaninfo:
+        return None, "未识别到豆瓣媒体信息"
+    return {"doubanid": doubaninfo.get("id")}, None
+
+
+# 媒体ID前缀与解析函数的对应关系
+_MEDIAID_RESOLVERS: Dict[str, Callable[[MediaChain, str, Optional[MediaType]],
+                                       Awaitable[Tuple[Optional[dict], Optional[str]]]]] = {
+    "tmdb": _resolve_tmdb,
+    "douban": _resolve_douban,
+    "bangumi": _resolve_bangumi,
+}
+
 
 @router.get("/last", summary="查询搜索结果", response_model=List[schemas.Context])
 async def search_latest(_: schemas.TokenPayload = Depends(verify_token)) -> Any:
@@ -26,7 +131,7 @@ async def search_latest(_: schemas.TokenPayload = Depends(verify_token)) -> Any:
     return [torrent.to_dict() for torrent in torrents]
 
 
-@router.get("/media/{mediaid}", summary="精确搜索资源", response_model=schemas.Response)
+@router.get("/media/{mediaid}", summary="精确搜索资源", response_class=ContextResponse)
 async def search_by_id(mediaid: str,
                        mtype: Optional[str] = None,
                        area: Optional[str] = "title",
@@ -38,77 +143,37 @@ async def search_by_id(mediaid: str,
     """
     根据TMDBID/豆瓣ID精确搜索站点资源 tmdb:/douban:/bangumi:
     """
+    media_type = _MEDIA_TYPES.get(mtype) if mtype else None
+    if mtype and not media_type:
+        return schemas.Response(success=False, message=f"无效的媒体类型：{mtype}")
+    try:
+        media_season = _parse_season(season)
+    except ValueError:
+        return schemas.Response(success=False, message=f"无效的季号：{season}")
+    try:
+        site_list = _parse_sites(sites)
+    except ValueError:
+        return schemas.Response(success=False, message=f"无效的站点参数：{sites}")
+
     # 取消正在运行的AI推荐（会清除数据库缓存）
     AIRecommendChain().cancel_ai_recommend()
-    
-    if mtype:
-        media_type = MediaType(mtype)
-    else:
-        media_type = None
-    if season:
-        media_season = int(season)
-    else:
-        media_season = None
-    if sites:
-        site_list = [int(site) for site in sites.split(",") if site]
-    else:
-        site_list = None
     torrents = None
     media_chain = MediaChain()
     search_chain = SearchChain()
     # 根据前缀识别媒体ID
-    if mediaid.startswith("tmdb:"):
-        tmdbid = int(mediaid.replace("tmdb:", ""))
-        if settings.RECOGNIZE_SOURCE == "douban":
-            # 通过TMDBID识别豆瓣ID
-            doubaninfo = await media_chain.async_get_doubaninfo_by_tmdbid(tmdbid=tmdbid, mtype=media_type)
-            if doubaninfo:
-                torrents = await search_chain.async_search_by_id(doubanid=doubaninfo.get("id"),
-                                                                 mtype=media_type, area=area, season=media_season,
-                                                                 sites=site_list, cache_local=True)
-            else:
-                return schemas.Response(success=False, message="未识别到豆瓣媒体信息")
-        else:
-            torrents = await search_chain.async_search_by_id(tmdbid=tmdbid, mtype=media_type, area=area,
-                                                             season=media_season,
-                                                             sites=site_list, cache_local=True)
-    elif mediaid.startswith("douban:"):
-        doubanid = mediaid.replace("douban:", "")
-        if settings.RECOGNIZE_SOURCE == "themoviedb":
-            # 通过豆瓣ID识别TMDBID
-            tmdbinfo = await media_chain.async_get_tmdbinfo_by_doubanid(doubanid=doubanid, mtype=media_type)
-            if tmdbinfo:
-                if tmdbinfo.get('season') and not media_season:
-                    media_season = tmdbinfo.get('season')
-                torrents = await search_chain.async_search_by_id(tmdbid=tmdbinfo.get("id"),
-                                                                 mtype=media_type, area=area, season=media_season,
-                                                                 sites=site_list, cache_local=True)
-            else:
-                return schemas.Response(success=False, message="未识别到TMDB媒体信息")
-        else:
-            torrents = await search_chain.async_search_by_id(doubanid=doubanid, mtype=media_type, area=area,
-                                                             season=media_season,
-                                                             sites=site_list, cache_local=True)
-    elif mediaid.startswith("bangumi:"):
-        bangumiid = int(mediaid.replace("bangumi:", ""))
-        if settings.RECOGNIZE_SOURCE == "themoviedb":
-            # 通过BangumiID识别TMDBID
-            tmdbinfo = await media_chain.async_get_tmdbinfo_by_bangumiid(bangumiid=bangumiid)
-            if tmdbinfo:
-                torrents = await search_chain.async_search_by_id(tmdbid=tmdbinfo.get("id"),
-                                                                 mtype=media_type, area=area, season=media_season,
-                                                                 sites=site_list, cache_local=True)
-            else:
-                return schemas.Response(success=False, message="未识别到TMDB媒体信息")
-        else:
-            # 通过BangumiID识别豆瓣ID
-            doubaninfo = await media_chain.async_get_doubaninfo_by_bangumiid(bangumiid=bangumiid)
-            if doubaninfo:
-                torrents = await search_chain.async_search_by_id(doubanid=doubaninfo.get("id"),
-                                                                 mtype=media_type, area=area, season=media_season,
-                                                                 sites=site_list, cache_local=True)
-            else:
-                return schemas.Response(success=False, message="未识别到豆瓣媒体信息")
+    prefix, sep, value = mediaid.partition(":")
+    resolver = _MEDIAID_RESOLVERS.get(prefix) if sep else None
+    if resolver:
+        search_ids, message = await resolver(media_chain, value, media_type)
+        if not search_ids:
+            return schemas.Response(success=False, message=message)
+        # 转换结果中带有季信息时，未指定季则使用转换结果
+        season_info = search_ids.pop("season", None)
+        if season_info and not media_season:
+            media_season = season_info
+        torrents = await search_chain.async_search_by_id(**search_ids, mtype=media_type, area=area,
+                                                         season=media_season,
+                                                         sites=site_list, cache_local=True)
     else:
         # 未知前缀，广播事件解析媒体信息
         event_data = MediaRecognizeConvertEventData(
@@ -153,10 +218,10 @@ async def search_by_id(mediaid: str,
     if not torrents:
         return schemas.Response(success=False, message="未搜索到任何资源")
     else:
-        return schemas.Response(success=True, data=[torrent.to_dict() for torrent in torrents])
+        return ContextResponse({"success": True, "message": None, "data": torrents})
 
 
-@router.get("/title", summary="模糊搜索资源", response_model=schemas.Response)
+@router.get("/title", summary="模糊搜索资源", response_class=ContextResponse)
 async def search_by_title(keyword: Optional[str] = None,
                           page: Optional[int] = 0,
                           sites: Optional[str] = None,
@@ -164,17 +229,22 @@ async def search_by_title(keyword: Optional[str] = None,
     """
     根据名称模糊搜索站点资源，支持分页，关键词为空是返回首页资源
     """
+    try:
+        site_list = _parse_sites(sites)
+    except ValueError:
+        return schemas.Response(success=False, message=f"无效的站点参数：{sites}")
+
     # 取消正在运行的AI推荐并清除数据库缓存
     AIRecommendChain().cancel_ai_recommend()
     
     torrents = await SearchChain().async_search_by_title(
         title=keyword, page=page,
-        sites=[int(site) for site in sites.split(",") if site] if sites else None,
+        sites=site_list,
         cache_local=True
     )
     if not torrents:
         return schemas.Response(success=False, message="未搜索到任何资源")
-    return schemas.Response(success=True, data=[torrent.to_dict() for torrent in torrents])
+    return ContextResponse({"success": True, "message": None, "data": torrents})
 
 
 @router.post("/recommend", summary="AI推荐资源", response_model=schemas.Response)
@@ -1,9 +1,11 @@
-from typing import List, Any, Annotated, Optional
+from functools import lru_cache
+from typing import List, Any, Annotated, Optional, Tuple, Dict, Callable, Awaitable
 
 import cn2an
 from fastapi import APIRouter, Request, BackgroundTasks, Depends, HTTPException, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
 
 from app import schemas
 from app.chain.subscribe import SubscribeChain
@@ -12,7 +14,7 @@ from app.core.context import MediaInfo
 from app.core.event import eventmanager
 from app.core.metainfo import MetaInfo
 from app.core.security import verify_token, verify_apitoken
-from app.db import get_async_db, get_db
+from app.db import get_async_db
 from app.db.models.subscribe import Subscribe
 from app.db.models.subscribehistory import SubscribeHistory
 from app.db.models.user import User
@@ -24,6 +26,28 @@ from app.schemas.types import MediaType, EventType, SystemConfigKey
 
 router = APIRouter()
 
+# 订阅模型字段
+_SUBSCRIBE_FIELDS = frozenset(schemas.Subscribe.model_fields)
+
+# 订阅列表接口返回的数据库列
+_SUBSCRIBE_COLUMNS = tuple(column.name for column in Subscribe.__table__.columns
+                           if column.name in _SUBSCRIBE_FIELDS)
+
+# 媒体ID前缀对应的订阅字段名及ID类型
+_MEDIAID_PREFIXES: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    "tmdb": ("tmdbid", int),
+    "douban": ("doubanid", str),
+    "bangumi": ("bangumiid", int),
+}
+
+# 按订阅字段查询单个订阅
+_SUBSCRIBE_LOOKUPS: Dict[str, Callable[[AsyncSession, Any, Optional[int]], Awaitable[Optional[Subscribe]]]] = {
+    "tmdbid": lambda db, value, season: Subscribe.async_exists(db, tmdbid=value, season=season),
+    "doubanid": lambda db, value, season: Subscribe.async_get_by_doubanid(db, value),
+    "bangumiid": lambda db, value, season: Subscribe.async_get_by_bangumiid(db, value),
+    "mediaid": lambda db, value, season: Subscribe.async_get_by_mediaid(db, value),
+}
+
 
 def start_subscribe_add(title: str, year: str,
                         mtype: MediaType, tmdbid: int, season: int, username: str):
@@ -34,17 +58,72 @@ def start_subscribe_add(title: str, year: str,
                          mtype=mtype, tmdbid=tmdbid, season=season, username=username)
 
 
-@router.get("/", summary="查询所有订阅", response_model=List[schemas.Subscribe])
+def start_subscribe_add_seasons(title: str, year: str,
+                                tmdbid: int, seasons: List[int], username: str):
+    """
+    启动多季订阅任务
+    """
+    SubscribeChain().add_seasons(title=title, year=year,
+                                 tmdbid=tmdbid, seasons=seasons, username=username)
+
+
+@lru_cache(maxsize=128)
+def _season_cn(season: int) -> str:
+    """
+    季号转换为中文小写数字
+    """
+    return cn2an.an2cn(season, "low")
+
+
+@lru_cache(maxsize=1024)
+def _parse_title(title: str, custom_words: Tuple[str, ...]) -> Tuple[Optional[str], Optional[int]]:
+    """
+    识别标题中的名称和季号，识别词作为缓存键的一部分，识别词变化后重新识别
+    """
+    meta = MetaInfo(title, custom_words=list(custom_words) or None)
+    return meta.name, meta.begin_season
+
+
+def _title_name_season(title: str) -> Tuple[Optional[str], Optional[int]]:
+    """
+    根据当前自定义识别词识别标题中的名称和季号
+    """
+    custom_words = SystemConfigOper().get(SystemConfigKey.CustomIdentifiers) or []
+    return _parse_title(title, tuple(custom_words))
+
+
+def _parse_mediaid(mediaid: str) -> Tuple[str, Any]:
+    """
+    解析带来源前缀的媒体ID，返回订阅字段名及ID值，ID无效时值为None，无法识别前缀时按自定义媒体ID处理
+    """
+    prefix, sep, value = mediaid.partition(":")
+    spec = _MEDIAID_PREFIXES.get(prefix) if sep else None
+    if not spec:
+        return "mediaid", mediaid
+    key, caster = spec
+    if not value or (caster is int and not value.isdigit()):
+        return key, None
+    return key, caster(value)
+
+
+def _merge_subscribe_info(old_subscribe_dict: dict, payload: dict) -> dict:
+    """
+    根据更新前的订阅数据和更新内容得到更新后的订阅数据，避免更新后再次查询数据库
+    """
+    return {**old_subscribe_dict, **{k: v for k, v in payload.items() if k in old_subscribe_dict}}
+
+
+@router.get("/", summary="查询所有订阅", response_class=ORJSONResponse)
 async def read_subscribes(
         db: AsyncSession = Depends(get_async_db),
         _: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
     查询所有订阅
     """
-    return await Subscribe.async_list(db)
+    return ORJSONResponse(await Subscribe.async_list_dicts(db, columns=_SUBSCRIBE_COLUMNS))
 
 
-@router.get("/list", summary="查询所有订阅（API_TOKEN）", response_model=List[schemas.Subscribe])
+@router.get("/list", summary="查询所有订阅（API_TOKEN）", response_class=ORJSONResponse)
 async def list_subscribes(_: Annotated[str, Depends(verify_apitoken)]) -> Any:
     """
     查询所有订阅 API_TOKEN认证（?token=xxx）
@@ -68,9 +147,7 @@ async def create_subscribe(
         mtype = None
     # 豆瓣标理
     if subscribe_in.doubanid or subscribe_in.bangumiid:
-        meta = MetaInfo(subscribe_in.name)
-        subscribe_in.name = meta.name
-        subscribe_in.season = meta.begin_season
+        subscribe_in.name, subscribe_in.season = _title_name_season(subscribe_in.name)
     # 标题转换
     if subscribe_in.name:
         title = subscribe_in.name
@@ -106,10 +183,11 @@ async def update_subscribe(
         return schemas.Response(success=False, message="订阅不存在")
     # 避免更新缺失集数
     old_subscribe_dict = subscribe.to_dict()
-    subscribe_dict = subscribe_in.model_dump()
+    # 只更新客户端提交的字段
+    subscribe_dict = subscribe_in.model_dump(exclude_unset=True)
     if not subscribe_in.lack_episode:
         # 没有缺失集数时，缺失集数清空，避免更新为0
-        subscribe_dict.pop("lack_episode")
+        subscribe_dict.pop("lack_episode", None)
     elif subscribe_in.total_episode:
         # 总集数增加时，缺失集数也要增加
         if subscribe_in.total_episode > (subscribe.total_episode or 0):
@@ -117,17 +195,15 @@ async def update_subscribe(
                                               + (subscribe_in.total_episode
                                                  - (subscribe.total_episode or 0)))
     # 是否手动修改过总集数
-    if subscribe_in.total_episode != subscribe.total_episode:
+    if "total_episode" in subscribe_dict and subscribe_in.total_episode != subscribe.total_episode:
         subscribe_dict["manual_total_episode"] = 1
     # 更新到数据库
     await subscribe.async_update(db, subscribe_dict)
-    # 重新获取更新后的订阅数据
-    updated_subscribe = await Subscribe.async_get(db, subscribe_in.id)
     # 发送订阅调整事件
     await eventmanager.async_send_event(EventType.SubscribeModified, {
         "subscribe_id": subscribe_in.id,
         "old_subscribe_info": old_subscribe_dict,
-        "subscribe_info": updated_subscribe.to_dict() if updated_subscribe else {},
+        "subscribe_info": _merge_subscribe_info(old_subscribe_dict, subscribe_dict),
     })
     return schemas.Response(success=True)
 
@@ -148,16 +224,15 @@ async def update_subscribe_status(
     if state not in valid_states:
         return schemas.Response(success=False, message="无效的订阅状态")
     old_subscribe_dict = subscribe.to_dict()
-    await subscribe.async_update(db, {
+    subscribe_dict = {
         "state": state
-    })
-    # 重新获取更新后的订阅数据
-    updated_subscribe = await Subscribe.async_get(db, subid)
+    }
+    await subscribe.async_update(db, subscribe_dict)
     # 发送订阅调整事件
     await eventmanager.async_send_event(EventType.SubscribeModified, {
         "subscribe_id": subid,
         "old_subscribe_info": old_subscribe_dict,
-        "subscribe_info": updated_subscribe.to_dict() if updated_subscribe else {},
+        "subscribe_info": _merge_subscribe_info(old_subscribe_dict, subscribe_dict),
     })
     return schemas.Response(success=True)
 
@@ -172,36 +247,16 @@ async def subscribe_mediaid(
     """
     根据 TMDBID/豆瓣ID/BangumiId 查询订阅 tmdb:/douban:
     """
-    title_check = False
-    if mediaid.startswith("tmdb:"):
-        tmdbid = mediaid[5:]
-        if not tmdbid or not str(tmdbid).isdigit():
-            return Subscribe()
-        result = await Subscribe.async_exists(db, tmdbid=int(tmdbid), season=season)
-    elif mediaid.startswith("douban:"):
-        doubanid = mediaid[7:]
-        if not doubanid:
-            return Subscribe()
-        result = await Subscribe.async_get_by_doubanid(db, doubanid)
-        if not result and title:
-            title_check = True
-    elif mediaid.startswith("bangumi:"):
-        bangumiid = mediaid[8:]
-        if not bangumiid or not str(bangumiid).isdigit():
-            return Subscribe()
-        result = await Subscribe.async_get_by_bangumiid(db, int(bangumiid))
-        if not result and title:
-            title_check = True
-    else:
-        result = await Subscribe.async_get_by_mediaid(db, mediaid)
-        if not result and title:
-            title_check = True
-    # 使用名称检查订阅
-    if title_check and title:
-        meta = MetaInfo(title)
+    key, value = _parse_mediaid(mediaid)
+    if value is None:
+        return Subscribe()
+    result = await _SUBSCRIBE_LOOKUPS[key](db, value, season)
+    # 非TMDBID未查询到订阅时使用名称检查订阅
+    if not result and title and key != "tmdbid":
+        name, begin_season = _title_name_season(title)
         if season is not None:
-            meta.begin_season = season
-        result = await Subscribe.async_get_by_title(db, title=meta.name, season=meta.begin_season)
+            begin_season = season
+        result = await Subscribe.async_get_by_title(db, title=name, season=begin_season)
 
     return result if result else Subscribe()
 
@@ -229,18 +284,17 @@ async def reset_subscribes(
         # 在更新之前获取旧数据
         old_subscribe_dict = subscribe.to_dict()
         # 更新订阅
-        await subscribe.async_update(db, {
+        subscribe_dict = {
             "note": [],
             "lack_episode": subscribe.total_episode,
             "state": "R"
-        })
-        # 重新获取更新后的订阅数据
-        updated_subscribe = await Subscribe.async_get(db, subid)
+        }
+        await subscribe.async_update(db, subscribe_dict)
         # 发送订阅调整事件
         await eventmanager.async_send_event(EventType.SubscribeModified, {
             "subscribe_id": subid,
             "old_subscribe_info": old_subscribe_dict,
-            "subscribe_info": updated_subscribe.to_dict() if updated_subscribe else {},
+            "subscribe_info": _merge_subscribe_info(old_subscribe_dict, subscribe_dict),
         })
         return schemas.Response(success=True)
     return schemas.Response(success=False, message="订阅不存在")
@@ -303,36 +357,27 @@ async def delete_subscribe_by_mediaid(
         _: schemas.TokenPayload = Depends(verify_token)
 ) -> Any:
     """
-    根据TMDBID或豆瓣ID删除订阅 tmdb:/douban:
-    """
-    delete_subscribes = []
-    if mediaid.startswith("tmdb:"):
-        tmdbid = mediaid[5:]
-        if not tmdbid or not str(tmdbid).isdigit():
-            return schemas.Response(success=False)
-        subscribes = await Subscribe.async_get_by_tmdbid(db, int(tmdbid), season)
-        delete_subscribes.extend(subscribes)
-    elif mediaid.startswith("douban:"):
-        doubanid = mediaid[7:]
-        if not doubanid:
-            return schemas.Response(success=False)
-        subscribe = await Subscribe.async_get_by_doubanid(db, doubanid)
-        if subscribe:
-            delete_subscribes.append(subscribe)
+    根据 TMDBID/豆瓣ID/BangumiId 删除订阅 tmdb:/douban:/bangumi:
+    """
+    key, value = _parse_mediaid(mediaid)
+    if value is None:
+        return schemas.Response(success=False)
+    if key == "tmdbid":
+        delete_subscribes = await Subscribe.async_get_by_tmdbid(db, value, season)
     else:
-        subscribe = await Subscribe.async_get_by_mediaid(db, mediaid)
-        if subscribe:
-            delete_subscribes.append(subscribe)
-    for subscribe in delete_subscribes:
+        subscribe = await _SUBSCRIBE_LOOKUPS[key](db, value, season)
+        delete_subscribes = [subscribe] if subscribe else []
+    if delete_subscribes:
         # 在删除之前获取订阅信息
-        subscribe_info = subscribe.to_dict()
-        subscribe_id = subscribe.id
-        await Subscribe.async_delete(db, subscribe_id)
+        subscribe_infos = [(subscribe.id, subscribe.to_dict()) for subscribe in delete_subscribes]
+        # 一次删除所有匹配的订阅
+        await Subscribe.async_delete_by_ids(db, [subscribe_id for subscribe_id, _ in subscribe_infos])
         # 发送事件
-        await eventmanager.async_send_event(EventType.SubscribeDeleted, {
-            "subscribe_id": subscribe_id,
-            "subscribe_info": subscribe_info
-        })
+        for subscribe_id, subscribe_info in subscribe_infos:
+            await eventmanager.async_send_event(EventType.SubscribeDeleted, {
+                "subscribe_id": subscribe_id,
+                "subscribe_info": subscribe_info
+            })
     return schemas.Response(success=True)
 
 
@@ -377,13 +422,12 @@ async def seerr_subscribe(request: Request, background_tasks: BackgroundTasks,
             if extra.get("name") == "Requested Seasons":
                 seasons = [int(str(sea).strip()) for sea in extra.get("value").split(", ") if str(sea).isdigit()]
                 break
-        for season in seasons:
-            background_tasks.add_task(start_subscribe_add,
-                                      mtype=media_type,
+        if seasons:
+            background_tasks.add_task(start_subscribe_add_seasons,
                                       tmdbid=tmdbId,
                                       title=subject,
                                       year="",
-                                      season=season,
+                                      seasons=seasons,
                                       username=user_name)
 
     return schemas.Response(success=True)
@@ -452,9 +496,7 @@ async def popular_subscribes(
             title = sub.get("name")
             season = sub.get("season")
             if season and int(season) > 1 and media.tmdb_id:
-                # 小写数据转大写
-                season_str = cn2an.an2cn(season, "low")
-                title = f"{title} 第{season_str}季"
+                title = f"{title} 第{_season_cn(int(season))}季"
             media.title = title
             media.year = sub.get("year")
             media.douban_id = sub.get("doubanid")
@@ -484,16 +526,16 @@ async def user_subscribes(
 
 
 @router.get("/files/{subscribe_id}", summary="订阅相关文件信息", response_model=schemas.SubscrbieInfo)
-def subscribe_files(
+async def subscribe_files(
         subscribe_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         _: schemas.TokenPayload = Depends(verify_token)) -> Any:
     """
     订阅相关文件信息
     """
-    subscribe = Subscribe.get(db, subscribe_id)
+    subscribe = await Subscribe.async_get(db, subscribe_id)
     if subscribe:
-        return SubscribeChain().subscribe_files_info(subscribe)
+        return await run_in_threadpool(SubscribeChain().subscribe_files_info, subscribe)
     return schemas.SubscrbieInfo()
 
 
@@ -529,11 +571,8 @@ async def subscribe_fork(
     """
     复用订阅
     """
-    sub_dict = sub.model_dump()
-    sub_dict.pop("id")
-    for key in list(sub_dict.keys()):
-        if not hasattr(schemas.Subscribe(), key):
-            sub_dict.pop(key)
+    sub_dict = {key: value for key, value in sub.model_dump().items()
+                if key != "id" and key in _SUBSCRIBE_FIELDS}
     result = await create_subscribe(subscribe_in=schemas.Subscribe(**sub_dict),
                                     current_user=current_user)
     if result.success:
@@ -578,7 +617,7 @@ async def unfollow_subscriber(
 
 
 @router.get("/shares", summary="查询分享的订阅", response_model=List[schemas.SubscribeShare])
-async def popular_subscribes(
+async def subscribe_shares(
         name: Optional[str] = None,
         page: Optional[int] = 1,
         count: Optional[int] = 30,
@@ -3,6 +3,7 @@ import json
 import re
 from collections import deque
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Union, Annotated
 
 import aiofiles
@@ -10,12 +11,15 @@ import pillow_avif  # noqa 用于自动注册AVIF支持
 from anyio import Path as AsyncPath
 from app.helper.sites import SitesHelper  # noqa  # noqa
 from fastapi import APIRouter, Body, Depends, HTTPException, Header, Request, Response
-from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from watchfiles import awatch
 
 from app import schemas
 from app.chain.mediaserver import MediaServerChain
 from app.chain.search import SearchChain
 from app.chain.system import SystemChain
+from app.core.cache import TTLCache, cached
 from app.core.config import global_vars, settings
 from app.core.event import eventmanager
 from app.core.metainfo import MetaInfo
@@ -25,6 +29,7 @@ from app.db.models import User
 from app.db.systemconfig_oper import SystemConfigOper
 from app.db.user_oper import get_current_active_superuser, get_current_active_superuser_async, \
     get_current_active_user_async
+from app.helper.downloader import enabled_downloaders
 from app.helper.llm import LLMHelper
 from app.helper.mediaserver import MediaServerHelper
 from app.helper.message import MessageHelper
@@ -45,6 +50,12 @@ from version import APP_VERSION
 
 router = APIRouter()
 
+# SSE响应头，禁止客户端缓存及反向代理缓冲
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# 已下发图片的ETag，按URL索引，用于在读取/下载图片前直接响应304
+_image_etags = TTLCache(region="image_etag", maxsize=4096, ttl=settings.GLOBAL_IMAGE_CACHE_DAYS * 24 * 3600)
+
 
 async def fetch_image(
         url: str,
@@ -67,6 +78,11 @@ async def fetch_image(
         logger.warn(f"Blocked unsafe image URL: {url}")
         return None
 
+    # 启用缓存时，客户端持有的ETag与该URL上次下发的一致，无需读取或下载图片
+    if use_cache and if_none_match and _image_etags.get(url) == if_none_match:
+        return Response(status_code=304,
+                        headers=RequestUtils.generate_cache_headers(if_none_match, max_age=86400 * 7))
+
     content = await ImageHelper().async_fetch_image(
         url=url,
         proxy=proxy,
@@ -75,8 +91,10 @@ async def fetch_image(
     )
     if content:
         # 检查 If-None-Match
-        etag = HashUtils.md5(content)
+        etag = HashUtils.xxh3(content)
         headers = RequestUtils.generate_cache_headers(etag, max_age=86400 * 7)
+        if use_cache:
+            _image_etags[url] = etag
         if if_none_match == etag:
             return Response(status_code=304, headers=headers)
         # 返回缓存图片
@@ -87,6 +105,16 @@ async def fetch_image(
         )
 
 
+@cached(maxsize=1, ttl=30)
+def image_proxy_domains() -> frozenset:
+    """
+    图片代理允许的域名（含媒体服务器地址），短时缓存，媒体服务器配置变更时清理
+    """
+    hosts = [config.config.get("host") for config in MediaServerHelper().get_configs().values() if
+             config and config.config and config.config.get("host")]
+    return frozenset(settings.SECURITY_IMAGE_DOMAINS) | frozenset(hosts)
+
+
 @router.get("/img/{proxy}", summary="图片代理")
 async def proxy_img(
         imgurl: str,
@@ -99,10 +127,7 @@ async def proxy_img(
     """
     图片代理，可选是否使用代理服务器，支持 HTTP 缓存
     """
-    # 媒体服务器添加图片代理支持
-    hosts = [config.config.get("host") for config in MediaServerHelper().get_configs().values() if
-             config and config.config and config.config.get("host")]
-    allowed_domains = set(settings.SECURITY_IMAGE_DOMAINS) | set(hosts)
+    allowed_domains = image_proxy_domains()
     cookies = (
         MediaServerChain().get_image_cookies(server=None, image_url=imgurl)
         if use_cookies
@@ -126,6 +151,22 @@ async def cache_img(
                              if_none_match=if_none_match)
 
 
+# 白名单模式，仅包含登录前UI初始化必需的字段
+_GLOBAL_SETTING_KEYS = (
+    "TMDB_IMAGE_DOMAIN",
+    "GLOBAL_IMAGE_CACHE",
+    "ADVANCED_MODE",
+)
+
+# 登录后获取的业务功能相关的配置字段
+_USER_GLOBAL_SETTING_KEYS = (
+    "RECOGNIZE_SOURCE",
+    "SEARCH_SOURCE",
+    "AI_RECOMMEND_ENABLED",
+    "PASSKEY_ALLOW_REGISTER_WITHOUT_OTP",
+)
+
+
 @router.get("/global", summary="查询非敏感系统设置", response_model=schemas.Response)
 def get_global_setting(token: str):
     """
@@ -135,14 +176,7 @@ def get_global_setting(token: str):
     if token != "moviepilot":
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    # 白名单模式，仅包含登录前UI初始化必需的字段
-    info = settings.model_dump(
-        include={
-            "TMDB_IMAGE_DOMAIN",
-            "GLOBAL_IMAGE_CACHE",
-            "ADVANCED_MODE",
-        }
-    )
+    info = {key: getattr(settings, key) for key in _GLOBAL_SETTING_KEYS}
     # 追加版本信息（用于版本检查）
     info.update({
         "FRONTEND_VERSION": SystemChain.get_frontend_version(),
@@ -158,23 +192,16 @@ async def get_user_global_setting(_: User = Depends(get_current_active_user_asyn
     查询用户相关系统设置（登录后获取）
     包含业务功能相关的配置和用户权限信息
     """
-    # 业务功能相关的配置字段
-    info = settings.model_dump(
-        include={
-            "RECOGNIZE_SOURCE",
-            "SEARCH_SOURCE",
-            "AI_RECOMMEND_ENABLED",
-            "PASSKEY_ALLOW_REGISTER_WITHOUT_OTP"
-        }
-    )
+    info = {key: getattr(settings, key) for key in _USER_GLOBAL_SETTING_KEYS}
     # 智能助手总开关未开启，智能推荐状态强制返回False
     if not settings.AI_AGENT_ENABLE:
         info["AI_RECOMMEND_ENABLED"] = False
 
-    # 追加用户唯一ID和订阅分享管理权限
-    share_admin = SubscribeHelper().is_admin_user()
+    # 追加用户唯一ID和订阅分享管理权限，助手初始化时可能请求Github及上报数据，放到线程池中执行
+    subscribe_helper = await run_in_threadpool(SubscribeHelper)
+    share_admin = subscribe_helper.is_admin_user()
     info.update({
-        "USER_UNIQUE_ID": SubscribeHelper().get_user_uuid(),
+        "USER_UNIQUE_ID": subscribe_helper.get_user_uuid(),
         "SUBSCRIBE_SHARE_MANAGE": share_admin,
         "WORKFLOW_SHARE_MANAGE": share_admin,
     })
@@ -194,7 +221,8 @@ async def get_env_setting(_: User = Depends(get_current_active_user_async)):
         "VERSION": APP_VERSION,
         "AUTH_VERSION": SitesHelper().auth_version,
         "INDEXER_VERSION": SitesHelper().indexer_version,
-        "FRONTEND_VERSION": SystemChain().get_frontend_version()
+        # 前端版本需读取版本文件，放到线程池中执行
+        "FRONTEND_VERSION": await run_in_threadpool(SystemChain.get_frontend_version)
     })
     return schemas.Response(success=True,
                             data=info)
@@ -251,11 +279,13 @@ async def get_progress(request: Request, process_type: str, _: schemas.TokenPayl
                     break
                 detail = progress.get()
                 yield f"data: {json.dumps(detail)}\n\n"
-                await asyncio.sleep(0.5)
+                # 等待下一次推送，系统停止时立即结束
+                if await global_vars.async_wait_system_stopped(0.5):
+                    break
         except asyncio.CancelledError:
             return
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    return StreamingResponse(event_generator(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
 
 @router.get("/setting/{key}", summary="查询系统设置", response_model=schemas.Response)
@@ -285,6 +315,9 @@ async def set_setting(
     if hasattr(settings, key):
         success, message = settings.update_setting(key=key, value=value)
         if success:
+            if key == "SECURITY_IMAGE_DOMAINS":
+                # 清理图片代理允许的域名缓存
+                image_proxy_domains.cache_clear()
             # 发送配置变更事件
             await eventmanager.async_send_event(etype=EventType.ConfigChanged, data=ConfigChangeEventData(
                 key=key,
@@ -300,6 +333,12 @@ async def set_setting(
             value = value if value else None
         success = await SystemConfigOper().async_set(key, value)
         if success:
+            if key == SystemConfigKey.Downloaders.value:
+                # 清理可用下载器缓存
+                enabled_downloaders.cache_clear()
+            elif key == SystemConfigKey.MediaServers.value:
+                # 清理图片代理允许的域名缓存
+                image_proxy_domains.cache_clear()
             # 发送配置变更事件
             await eventmanager.async_send_event(etype=EventType.ConfigChanged, data=ConfigChangeEventData(
                 key=key,
@@ -336,21 +375,30 @@ async def get_message(request: Request, role: Optional[str] = "system",
             while not global_vars.is_system_stopped:
                 if await request.is_disconnected():
                     break
-                detail = message.get(role)
-                yield f"data: {detail or ''}\n\n"
-                await asyncio.sleep(3)
+                # 一次取出所有待发送消息，合并为一次输出
+                details = []
+                while len(details) < 50:
+                    detail = message.get(role)
+                    if not detail:
+                        break
+                    details.append(f"data: {detail}\n\n")
+                yield "".join(details) or "data: \n\n"
+                # 等待下一次推送，系统停止时立即结束
+                if await global_vars.async_wait_system_stopped(3):
+                    break
         except asyncio.CancelledError:
             return
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    return StreamingResponse(event_generator(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
 
 @router.get("/logging", summary="实时日志")
 async def get_logging(request: Request, length: Optional[int] = 50, logfile: Optional[str] = "moviepilot.log",
+                      reverse: Optional[bool] = True,
                       _: schemas.TokenPayload = Depends(verify_resource_token)):
     """
     实时获取系统日志
-    length = -1 时, 返回text/plain
+    length = -1 时, 返回text/plain，reverse 为 False 时按原始顺序直接返回日志文件
     否则 返回格式SSE
     """
     base_path = AsyncPath(settings.LOG_PATH)
@@ -387,11 +435,11 @@ async def get_logging(request: Request, length: Optional[int] = 50, logfile: Opt
                     # 小文件直接读取全部内容
                     content = await f.read()
 
-                # 按行分割并添加到队列，只保留非空行
-                lines = [line.strip() for line in content.splitlines() if line.strip()]
-                # 只取最后N行
-                for line in lines[-max(length, 50):]:
-                    lines_queue.append(line)
+                # 按行添加到队列，只保留非空行，队列满时自动丢弃较早的行
+                for line in content.splitlines():
+                    line = line.strip()
+                    if line:
+                        lines_queue.append(line)
 
             # 输出历史日志
             for line in lines_queue:
@@ -401,50 +449,61 @@ async def get_logging(request: Request, length: Optional[int] = 50, logfile: Opt
             async with aiofiles.open(log_path, mode="r", encoding="utf-8", errors="ignore") as f:
                 # 移动文件指针到文件末尾，继续监听新增内容
                 await f.seek(0, 2)
-                # 记录初始文件大小
-                initial_stat = await log_path.stat()
-                initial_size = initial_stat.st_size
-                # 实时监听新日志，使用更短的轮询间隔
-                while not global_vars.is_system_stopped:
-                    if await request.is_disconnected():
+                # 由系统文件事件唤醒读取新日志，空闲时每秒检查一次连接状态
+                async for _changes in awatch(str(log_path), stop_event=global_vars.async_stop_event,
+                                             rust_timeout=1000, yield_on_timeout=True):
+                    if global_vars.is_system_stopped or await request.is_disconnected():
                         break
-                    # 检查文件是否有新内容
-                    current_stat = await log_path.stat()
-                    current_size = current_stat.st_size
-                    if current_size > initial_size:
-                        # 文件有新内容，读取新行
-                        line = await f.readline()
+                    # 读取本次变化新增的所有行
+                    for line in await f.readlines():
+                        line = line.strip()
                         if line:
-                            line = line.strip()
-                            if line:
-                                yield f"data: {line}\n\n"
-                        initial_size = current_size
-                    else:
-                        # 没有新内容，短暂等待
-                        await asyncio.sleep(0.5)
+                            yield f"data: {line}\n\n"
         except asyncio.CancelledError:
             return
         except Exception as err:
             logger.error(f"日志读取异常: {err}")
             yield f"data: 日志读取异常: {err}\n\n"
 
+    async def log_reverse_generator():
+        block_size = 64 * 1024
+        try:
+            async with aiofiles.open(log_path, mode="rb") as f:
+                position = await f.seek(0, 2)
+                # 块首不完整的行，与前一块拼接后再输出
+                remain = b""
+                first = True
+                while position > 0:
+                    read_size = min(block_size, position)
+                    position -= read_size
+                    await f.seek(position)
+                    parts = (await f.read(read_size) + remain).split(b"\n")
+                    remain = parts[0]
+                    if len(parts) == 1:
+                        continue
+                    lines = [part.decode("utf-8", errors="ignore").rstrip("\r") for part in reversed(parts[1:])]
+                    yield ("" if first else "\n") + "\n".join(lines)
+                    first = False
+                yield ("" if first else "\n") + remain.decode("utf-8", errors="ignore").rstrip("\r")
+        except asyncio.CancelledError:
+            return
+        except Exception as err:
+            logger.error(f"日志读取异常: {err}")
+            yield f"读取日志文件失败: {err}"
+
     # 根据length参数返回不同的响应
     if length == -1:
         # 返回全部日志作为文本响应
         if not await log_path.exists():
             return Response(content="日志文件不存在！", media_type="text/plain")
-        try:
-            # 使用 aiofiles 异步读取文件
-            async with aiofiles.open(log_path, mode="r", encoding="utf-8", errors="ignore") as file:
-                text = await file.read()
-            # 倒序输出
-            text = "\n".join(text.split("\n")[::-1])
-            return Response(content=text, media_type="text/plain")
-        except Exception as e:
-            return Response(content=f"读取日志文件失败: {e}", media_type="text/plain")
+        if not reverse:
+            # 无需倒序时直接返回文件，由服务器完成文件传输
+            return FileResponse(log_path, media_type="text/plain")
+        # 从文件末尾按块倒序读取，逐块输出，避免整个文件读入内存
+        return StreamingResponse(log_reverse_generator(), media_type="text/plain")
     else:
         # 返回SSE流响应
-        return StreamingResponse(log_generator(), media_type="text/event-stream")
+        return StreamingResponse(log_generator(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
 
 @router.get("/versions", summary="查询Github所有Release版本", response_model=schemas.Response)
@@ -493,6 +552,14 @@ def ruletest(title: str,
     })
 
 
+@lru_cache(maxsize=128)
+def _include_pattern(include: str) -> re.Pattern:
+    """
+    编译网络测试的包含规则，相同规则直接复用
+    """
+    return re.compile(include, re.IGNORECASE)
+
+
 @router.get("/nettest", summary="测试网络连通性")
 async def nettest(
         url: str,
@@ -542,7 +609,7 @@ async def nettest(
             success=False, message=f"{proxy_name}无法连接", data={"time": time}
         )
     elif result.status_code == 200:
-        if include and not re.search(r"%s" % include, result.text, re.IGNORECASE):
+        if include and not _include_pattern(include).search(result.text):
             # 通常是被加速代理跳转到其它页面了
             logger.error(f"{url} 的响应内容不匹配包含规则 {include}")
             if proxy_name:
@@ -16,6 +16,9 @@ from app.utils.otp import OtpUtils
 
 router = APIRouter()
 
+# 正则表达式匹配密码包含字母、数字、特殊字符中的至少两项
+_PASSWORD_PATTERN = re.compile(r'^(?![a-zA-Z]+$)(?!\d+$)(?![^\da-zA-Z\s]+$).{6,50}$')
+
 
 @router.get("/", summary="所有用户", response_model=List[schemas.User])
 async def list_users(
@@ -61,9 +64,7 @@ async def update_user(
     """
     user_info = user_in.model_dump()
     if user_info.get("password"):
-        # 正则表达式匹配密码包含字母、数字、特殊字符中的至少两项
-        pattern = r'^(?![a-zA-Z]+$)(?!\d+$)(?![^\da-zA-Z\s]+$).{6,50}$'
-        if not re.match(pattern, user_info.get("password")):
+        if not _PASSWORD_PATTERN.match(user_info.get("password")):
             return schemas.Response(success=False,
                                     message="密码需要同时包含字母、数字、特殊字符中的至少两项，且长度大于6位")
         user_info["hashed_password"] = get_password_hash(user_info["password"])
@@ -73,10 +74,8 @@ async def update_user(
     if not user_name:
         return schemas.Response(success=False, message="用户名不能为空")
     # 新用户名去重
-    users = await current_user.async_list(db)
-    for u in users:
-        if u.name == user_name and u.id != user_info["id"]:
-            return schemas.Response(success=False, message="用户名已被使用")
+    if await User.async_name_taken(db, name=user_name, exclude_id=user_info["id"]):
+        return schemas.Response(success=False, message="用户名已被使用")
     if not user:
         return schemas.Response(success=False, message="用户不存在")
     await user.async_update(db, user_info)
@@ -99,8 +98,8 @@ async def upload_avatar(user_id: int, db: AsyncSession = Depends(get_async_db),
     """
     上传用户头像
     """
-    # 将文件转换为Base64
-    file_base64 = base64.b64encode(file.file.read())
+    # 异步读取上传文件并转换为Base64
+    file_base64 = base64.b64encode(await file.read()).decode()
     # 更新到用户表
     user = await User.async_get(db, user_id)
     if not user:
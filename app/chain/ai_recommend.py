@@ -27,6 +27,7 @@ class AIRecommendChain(ChainBase, metaclass=Singleton):
     _current_request_hash: Optional[str] = None  # 当前请求的哈希值
     _ai_recommend_result: Optional[List[int]] = None  # AI推荐索引缓存（索引列表）
     _ai_recommend_error: Optional[str] = None  # AI推荐错误信息
+    _ai_recommend_cache_dirty: bool = True  # 持久化缓存中是否可能存在推荐结果，启动时未知视为存在
 
     @staticmethod
     def _calculate_request_hash(
@@ -176,7 +177,10 @@ Output Format: Return ONLY a JSON array of "index" numbers (e.g., [0, 3, 1]). Do
         self._current_request_hash = None
         self._ai_recommend_result = None
         self._ai_recommend_error = None
-        self.remove_cache(self.__ai_indices_cache_file)
+        # 缓存已清除且此后未保存过结果时无需再次删除，避免每次搜索都访问缓存存储
+        if self._ai_recommend_cache_dirty:
+            self.remove_cache(self.__ai_indices_cache_file)
+            self._ai_recommend_cache_dirty = False
 
     def start_recommend_task(
         self,
@@ -294,6 +298,7 @@ Output Format: Return ONLY a JSON array of "index" numbers (e.g., [0, 3, 1]). Do
 
                         # 保存到数据库
                         self.save_cache(original_indices, self.__ai_indices_cache_file)
+                        self._ai_recommend_cache_dirty = True
                         logger.info(f"AI推荐完成: {len(original_indices)}项")
 
                     except Exception as e:
@@ -523,6 +523,8 @@ class SearchChain(ChainBase):
         # 配置的索引站点
         if not sites:
             sites = SystemConfigOper().get(SystemConfigKey.IndexerSites) or []
+        # 去重并保持配置顺序
+        sites = list(dict.fromkeys(sites))
 
         for indexer in SitesHelper().get_indexers():
             # 检查站点索引开关
@@ -605,6 +607,8 @@ class SearchChain(ChainBase):
         # 配置的索引站点
         if not sites:
             sites = SystemConfigOper().get(SystemConfigKey.IndexerSites) or []
+        # 去重并保持配置顺序
+        sites = list(dict.fromkeys(sites))
 
         for indexer in await SitesHelper().async_get_indexers():
             # 检查站点索引开关
@@ -131,14 +131,15 @@ class SubscribeChain(ChainBase):
             username: Optional[str] = None,
             message: Optional[bool] = True,
             exist_ok: Optional[bool] = False,
+            mediainfo: Optional[MediaInfo] = None,
             **kwargs) -> Tuple[Optional[int], str]:
         """
         识别媒体信息并添加订阅
+        :param mediainfo: 已识别的媒体信息，提供时不再重复识别
         """
 
         logger.info(f'开始添加订阅，标题：{title} ...')
 
-        mediainfo = None
         metainfo = MetaInfo(title)
         if year:
             metainfo.year = year
@@ -148,34 +149,35 @@ class SubscribeChain(ChainBase):
             metainfo.type = MediaType.TV
             metainfo.begin_season = season
         # 识别媒体信息
-        if settings.RECOGNIZE_SOURCE == "themoviedb":
-            # TMDB识别模式
-            if not tmdbid:
+        if not mediainfo:
+            if settings.RECOGNIZE_SOURCE == "themoviedb":
+                # TMDB识别模式
+                if not tmdbid:
+                    if doubanid:
+                        # 将豆瓣信息转换为TMDB信息
+                        tmdbinfo = MediaChain().get_tmdbinfo_by_doubanid(doubanid=doubanid, mtype=mtype)
+                        if tmdbinfo:
+                            mediainfo = MediaInfo(tmdb_info=tmdbinfo)
+                    elif mediaid:
+                        # 未知前缀，广播事件解析媒体信息
+                        mediainfo = self.__get_event_media(mediaid, metainfo)
+                else:
+                    # 使用TMDBID识别
+                    mediainfo = self.recognize_media(meta=metainfo, mtype=mtype, tmdbid=tmdbid,
+                                                     episode_group=episode_group, cache=False)
+            else:
                 if doubanid:
-                    # 将豆瓣信息转换为TMDB信息
-                    tmdbinfo = MediaChain().get_tmdbinfo_by_doubanid(doubanid=doubanid, mtype=mtype)
-                    if tmdbinfo:
-                        mediainfo = MediaInfo(tmdb_info=tmdbinfo)
+                    # 豆瓣识别模式，不使用缓存
+                    mediainfo = self.recognize_media(meta=metainfo, mtype=mtype, doubanid=doubanid, cache=False)
                 elif mediaid:
                     # 未知前缀，广播事件解析媒体信息
                     mediainfo = self.__get_event_media(mediaid, metainfo)
-            else:
-                # 使用TMDBID识别
-                mediainfo = self.recognize_media(meta=metainfo, mtype=mtype, tmdbid=tmdbid,
-                                                 episode_group=episode_group, cache=False)
-        else:
-            if doubanid:
-                # 豆瓣识别模式，不使用缓存
-                mediainfo = self.recognize_media(meta=metainfo, mtype=mtype, doubanid=doubanid, cache=False)
-            elif mediaid:
-                # 未知前缀，广播事件解析媒体信息
-                mediainfo = self.__get_event_media(mediaid, metainfo)
-            if mediainfo:
-                # 豆瓣标题处理
-                meta = MetaInfo(mediainfo.title)
-                mediainfo.title = meta.name
-                if season is None:
-                    season = meta.begin_season
+                if mediainfo:
+                    # 豆瓣标题处理
+                    meta = MetaInfo(mediainfo.title)
+                    mediainfo.title = meta.name
+                    if season is None:
+                        season = meta.begin_season
 
         # 使用名称识别兜底
         if not mediainfo:
@@ -294,6 +296,20 @@ class SubscribeChain(ChainBase):
         # 返回结果
         return sid, err_msg
 
+    def add_seasons(self, title: str, year: str, tmdbid: int, seasons: List[int],
+                    username: Optional[str] = None, **kwargs) -> List[Tuple[Optional[int], str]]:
+        """
+        按TMDBID添加电视剧多个季的订阅，TMDB识别模式下媒体信息只识别一次
+        """
+        mediainfo = None
+        if settings.RECOGNIZE_SOURCE == "themoviedb":
+            mediainfo = self.recognize_media(mtype=MediaType.TV, tmdbid=tmdbid, cache=False)
+        return [
+            self.add(title=title, year=year, mtype=MediaType.TV, tmdbid=tmdbid,
+                     season=season, username=username, mediainfo=mediainfo, **kwargs)
+            for season in seasons
+        ]
+
     async def async_add(self, title: str, year: str,
                         mtype: MediaType = None,
                         tmdbid: Optional[int] = None,
@@ -117,12 +117,13 @@ class CacheBackend(ABC):
         pass
 
     @abstractmethod
-    def delete(self, key: str, region: Optional[str] = DEFAULT_CACHE_REGION) -> None:
+    def delete(self, key: str, region: Optional[str] = DEFAULT_CACHE_REGION) -> bool:
         """
         删除缓存
 
         :param key: 缓存的键
         :param region: 缓存的区
+        :return: 是否删除了存在的缓存项
         """
         pass
 
@@ -172,8 +173,8 @@ class CacheBackend(ABC):
         弹出缓存项，类似 dict.pop()
         """
         value = self.get(key, region=region)
-        if value is not None:
-            self.delete(key, region=region)
+        # 以删除结果为准，并发弹出同一键时只有一方能取得值
+        if value is not None and self.delete(key, region=region):
             return value
         if default is not None:
             return default
@@ -435,18 +436,23 @@ class MemoryBackend(CacheBackend):
             return None
         return region_cache.get(key)
 
-    def delete(self, key: str, region: Optional[str] = DEFAULT_CACHE_REGION):
+    def delete(self, key: str, region: Optional[str] = DEFAULT_CACHE_REGION) -> bool:
         """
         删除缓存
 
         :param key: 缓存的键
         :param region: 缓存的区
+        :return: 是否删除了存在的缓存项
         """
         region_cache = self.__get_region_cache(region)
         if region_cache is None:
-            return
+            return False
         with lock:
-            del region_cache[key]
+            try:
+                del region_cache[key]
+                return True
+            except KeyError:
+                return False
 
     def clear(self, region: Optional[str] = DEFAULT_CACHE_REGION) -> None:
         """
@@ -674,14 +680,15 @@ class RedisBackend(CacheBackend):
         """
         return self.redis_helper.get(key, region=region)
 
-    def delete(self, key: str, region: Optional[str] = DEFAULT_CACHE_REGION) -> None:
+    def delete(self, key: str, region: Optional[str] = DEFAULT_CACHE_REGION) -> bool:
         """
         删除缓存
 
         :param key: 缓存的键
         :param region: 缓存的区
+        :return: 是否删除了存在的缓存项
         """
-        self.redis_helper.delete(key, region=region)
+        return self.redis_helper.delete(key, region=region)
 
     def clear(self, region: Optional[str] = DEFAULT_CACHE_REGION) -> None:
         """
@@ -845,16 +852,20 @@ class FileBackend(CacheBackend):
         with open(cache_path, 'rb') as f:
             return f.read()
 
-    def delete(self, key: str, region: Optional[str] = DEFAULT_CACHE_REGION) -> None:
+    def delete(self, key: str, region: Optional[str] = DEFAULT_CACHE_REGION) -> bool:
         """
         删除缓存
 
         :param key: 缓存的键
         :param region: 缓存的区
+        :return: 是否删除了存在的缓存项
         """
         cache_path = self.base / region / key
-        if cache_path.exists():
+        try:
             cache_path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
 
     def clear(self, region: Optional[str] = DEFAULT_CACHE_REGION) -> None:
         """
@@ -1349,12 +1360,12 @@ class CacheProxy:
         kwargs.setdefault('region', self._region)
         self._cache_backend.set(key, value, **kwargs)
 
-    def delete(self, key: str, **kwargs) -> None:
+    def delete(self, key: str, **kwargs) -> bool:
         """
-        删除缓存值
+        删除缓存值，返回是否删除了存在的缓存项
         """
         kwargs.setdefault('region', self._region)
-        self._cache_backend.delete(key, **kwargs)
+        return self._cache_backend.delete(key, **kwargs)
 
     def exists(self, key: str, **kwargs) -> bool:
         """
@@ -899,12 +899,18 @@ class GlobalVar(object):
     EMERGENCY_STOP_TRANSFER: List[str] = []
     # 当前事件循环
     CURRENT_EVENT_LOOP: AbstractEventLoop = asyncio.get_event_loop()
+    # 系统停止异步事件及其所属事件循环，供协程等待
+    ASYNC_STOP_EVENT: Optional[asyncio.Event] = None
+    ASYNC_STOP_LOOP: Optional[AbstractEventLoop] = None
 
     def stop_system(self):
         """
         停止系统
         """
         self.STOP_EVENT.set()
+        # 唤醒正在等待系统停止的协程，可能在其它线程中调用
+        if self.ASYNC_STOP_EVENT and self.ASYNC_STOP_LOOP and not self.ASYNC_STOP_LOOP.is_closed():
+            self.ASYNC_STOP_LOOP.call_soon_threadsafe(self.ASYNC_STOP_EVENT.set)
 
     @property
     def is_system_stopped(self):
@@ -913,6 +919,28 @@ class GlobalVar(object):
         """
         return self.STOP_EVENT.is_set()
 
+    @property
+    def async_stop_event(self) -> asyncio.Event:
+        """
+        系统停止异步事件，需在事件循环中获取
+        """
+        if self.ASYNC_STOP_EVENT is None:
+            self.ASYNC_STOP_EVENT = asyncio.Event()
+            self.ASYNC_STOP_LOOP = asyncio.get_running_loop()
+            if self.is_system_stopped:
+                self.ASYNC_STOP_EVENT.set()
+        return self.ASYNC_STOP_EVENT
+
+    async def async_wait_system_stopped(self, timeout: float) -> bool:
+        """
+        等待系统停止，超时未停止返回False
+        """
+        try:
+            await asyncio.wait_for(self.async_stop_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     def get_subscriptions(self):
         """
         获取webpush订阅
@@ -3,6 +3,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Any, Tuple, Optional
 
+from pydantic import BaseModel
+
 from app.core.config import settings
 from app.core.meta import MetaBase
 from app.core.metainfo import MetaInfo
@@ -87,6 +89,15 @@ class TorrentInfo:
                 continue
             setattr(self, key, value)
 
+    @classmethod
+    def from_model(cls, model: BaseModel) -> "TorrentInfo":
+        """
+        从Pydantic模型直接初始化，免去 model_dump 的整体序列化
+        """
+        torrentinfo = cls()
+        torrentinfo.from_dict(model.__dict__)
+        return torrentinfo
+
     @staticmethod
     def get_free_string(upload_volume_factor: float, download_volume_factor: float) -> str:
         """
@@ -308,6 +319,15 @@ class MediaInfo:
         if isinstance(self.type, str):
             self.type = MediaType(self.type)
 
+    @classmethod
+    def from_model(cls, model: BaseModel) -> "MediaInfo":
+        """
+        从Pydantic模型直接初始化，免去 model_dump 的整体序列化
+        """
+        mediainfo = cls()
+        mediainfo.from_dict(model.__dict__)
+        return mediainfo
+
     def set_image(self, name: str, image: str):
         """
         设置图片地址
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Any, Generator, List, Optional, Self, Tuple, AsyncGenerator, Union
+from typing import Any, Dict, Generator, List, Optional, Self, Tuple, AsyncGenerator, Union
 
 from sqlalchemy import NullPool, QueuePool, and_, create_engine, inspect, text, select, delete, Column, Integer, \
     Sequence, Identity
@@ -426,6 +426,10 @@ def async_db_query(func):
     return wrapper
 
 
+# 各模型的字段名缓存，避免每次 to_dict 都遍历表结构
+_column_names: Dict[type, Tuple[str, ...]] = {}
+
+
 @as_declarative()
 class Base:
     id: Any
@@ -501,7 +505,10 @@ class Base:
         return result.scalars().all()
 
     def to_dict(self):
-        return {c.name: getattr(self, c.name, None) for c in self.__table__.columns}  # noqa
+        names = _column_names.get(type(self))
+        if names is None:
+            names = _column_names[type(self)] = tuple(c.name for c in self.__table__.columns)  # noqa
+        return {name: getattr(self, name, None) for name in names}
 
     @declared_attr
     def __tablename__(self) -> str:
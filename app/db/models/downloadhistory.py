@@ -1,11 +1,11 @@
 import time
 from typing import Optional
 
-from sqlalchemy import Column, Integer, String, JSON, select
+from sqlalchemy import Column, Integer, String, JSON, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import db_query, db_update, get_id_column, Base, async_db_query
+from app.db import db_query, db_update, get_id_column, Base, async_db_query, async_db_update
 
 
 class DownloadHistory(Base):
@@ -81,10 +81,17 @@ class DownloadHistory(Base):
 
     @classmethod
     @async_db_query
-    async def async_list_by_page(cls, db: AsyncSession, page: Optional[int] = 1, count: Optional[int] = 30):
+    async def async_list_by_page(cls, db: AsyncSession, page: Optional[int] = 1, count: Optional[int] = 30,
+                                 as_dict: bool = False):
+        """
+        分页查询，as_dict为True时直接按列查询并返回字典列表，不构造ORM对象
+        """
+        query = select(cls.__table__) if as_dict else select(cls)
         result = await db.execute(
-            select(cls).offset((page - 1) * count).limit(count)
+            query.offset((page - 1) * count).limit(count)
         )
+        if as_dict:
+            return [dict(row) for row in result.mappings()]
         return result.scalars().all()
 
     @classmethod
@@ -239,3 +246,11 @@ class DownloadFiles(Base):
                 "state": 0
             }
         )
+
+    @classmethod
+    @async_db_update
+    async def async_delete_by_fullpath(cls, db: AsyncSession, fullpath: str):
+        await db.execute(
+            update(cls).where(cls.fullpath == fullpath,
+                              cls.state == 1).values(state=0)
+        )
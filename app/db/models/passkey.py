@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, select,
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import Any, Dict, List
 
 from app.db import Base, db_query, db_update, async_db_query, async_db_update, get_id_column
 
@@ -48,6 +49,18 @@ class PassKey(Base):
         )
         return result.scalars().all()
 
+    @classmethod
+    @async_db_query
+    async def async_list_credentials(cls, db: AsyncSession, user_id: int) -> List[Dict[str, Any]]:
+        """异步获取用户所有可用PassKey的凭证ID及传输方式，不构建ORM对象"""
+        result = await db.execute(
+            select(cls.credential_id, cls.transports).filter(cls.user_id == user_id, cls.is_active.is_(True))
+        )
+        return [
+            {'credential_id': credential_id, 'transports': transports}
+            for credential_id, transports in result.all()
+        ]
+
     @classmethod
     @db_query
     def get_by_credential_id(cls, db: Session, credential_id: str):
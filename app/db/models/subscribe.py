@@ -1,7 +1,7 @@
 import time
-from typing import Optional
+from typing import Iterable, List, Optional
 
-from sqlalchemy import Column, Integer, String, Float, JSON, select
+from sqlalchemy import Column, Integer, String, Float, JSON, select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
@@ -122,6 +122,17 @@ class Subscribe(Base):
             return None
         return result.scalars().first()
 
+    @classmethod
+    @async_db_query
+    async def async_list_dicts(cls, db: AsyncSession, columns: Optional[Iterable[str]] = None) -> List[dict]:
+        """
+        按列查询所有订阅并返回字典列表，不构造ORM对象，可指定查询的列
+        """
+        table = cls.__table__
+        query = select(*(table.c[name] for name in columns)) if columns else select(table)
+        result = await db.execute(query)
+        return [dict(row) for row in result.mappings()]
+
     @classmethod
     @db_query
     def get_by_state(cls, db: Session, state: str):
@@ -329,6 +340,12 @@ class Subscribe(Base):
             await subscribe.async_delete(db, subscribe.id)
         return True
 
+    @classmethod
+    @async_db_update
+    async def async_delete_by_ids(cls, db: AsyncSession, ids: List[int]):
+        await db.execute(delete(cls).where(cls.id.in_(ids)))
+        return True
+
     @classmethod
     @db_query
     def list_by_username(cls, db: Session, username: str, state: Optional[str] = None, mtype: Optional[str] = None):
@@ -88,15 +88,19 @@ class TransferHistory(Base):
     @classmethod
     @async_db_query
     async def async_list_by_title(cls, db: AsyncSession, title: str, page: Optional[int] = 1, count: Optional[int] = 30,
-                                  status: bool = None):
+                                  status: bool = None, as_dict: bool = False):
+        """
+        按标题分页查询，as_dict为True时直接按列查询并返回字典列表，不构造ORM对象
+        """
+        query = select(cls.__table__) if as_dict else select(cls)
         if status is not None:
-            query = select(cls).filter(
+            query = query.filter(
                 cls.status == status
             ).order_by(
                 cls.date.desc()
             )
         else:
-            query = select(cls).filter(or_(
+            query = query.filter(or_(
                 cls.title.like(f'%{title}%'),
                 cls.src.like(f'%{title}%'),
                 cls.dest.like(f'%{title}%'),
@@ -109,6 +113,8 @@ class TransferHistory(Base):
             query = query.offset((page - 1) * count).limit(count)
         
         result = await db.execute(query)
+        if as_dict:
+            return [dict(row) for row in result.mappings()]
         return result.scalars().all()
 
     @classmethod
@@ -134,15 +140,19 @@ class TransferHistory(Base):
     @classmethod
     @async_db_query
     async def async_list_by_page(cls, db: AsyncSession, page: Optional[int] = 1, count: Optional[int] = 30,
-                                 status: bool = None):
+                                 status: bool = None, as_dict: bool = False):
+        """
+        分页查询，as_dict为True时直接按列查询并返回字典列表，不构造ORM对象
+        """
+        query = select(cls.__table__) if as_dict else select(cls)
         if status is not None:
-            query = select(cls).filter(
+            query = query.filter(
                 cls.status == status
             ).order_by(
                 cls.date.desc()
             )
         else:
-            query = select(cls).order_by(
+            query = query.order_by(
                 cls.date.desc()
             )
         
@@ -151,6 +161,8 @@ class TransferHistory(Base):
             query = query.offset((page - 1) * count).limit(count)
         
         result = await db.execute(query)
+        if as_dict:
+            return [dict(row) for row in result.mappings()]
         return result.scalars().all()
 
     @classmethod
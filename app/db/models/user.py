@@ -1,8 +1,11 @@
-from sqlalchemy import Boolean, Column, JSON, String, select
+from typing import Optional, Tuple
+
+from sqlalchemy import Boolean, Column, JSON, String, select, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db import Base, db_query, db_update, async_db_query, async_db_update, get_id_column
+from app.db.models.passkey import PassKey
 
 
 class User(Base):
@@ -45,6 +48,50 @@ class User(Base):
         )
         return result.scalars().first()
 
+    @classmethod
+    @async_db_query
+    async def async_name_taken(cls, db: AsyncSession, name: str, exclude_id: Optional[int] = None) -> bool:
+        """
+        用户名是否已被其他用户使用
+        """
+        query = select(cls.id).filter(cls.name == name)
+        if exclude_id is not None:
+            query = query.filter(cls.id != exclude_id)
+        result = await db.execute(query.limit(1))
+        return result.first() is not None
+
+    @classmethod
+    @async_db_query
+    async def async_get_mfa_status(cls, db: AsyncSession, name: str) -> Tuple[bool, bool]:
+        """
+        一次查询用户是否启用OTP及是否存在可用的PassKey，用户不存在时均为False
+        """
+        has_passkey = exists().where(PassKey.user_id == cls.id, PassKey.is_active.is_(True))
+        result = await db.execute(
+            select(cls.is_otp, has_passkey).filter(cls.name == name)
+        )
+        row = result.first()
+        if not row:
+            return False, False
+        return bool(row[0]), bool(row[1])
+
+    @classmethod
+    @async_db_query
+    async def async_get_by_passkey(cls, db: AsyncSession,
+                                   credential_id: str) -> Optional[Tuple["User", PassKey]]:
+        """
+        根据凭证ID一次联表查询可用的PassKey及其所属的已激活用户
+        """
+        result = await db.execute(
+            select(cls, PassKey).join(PassKey, PassKey.user_id == cls.id).filter(
+                PassKey.credential_id == credential_id,
+                PassKey.is_active.is_(True),
+                cls.is_active.is_(True)
+            )
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
     @classmethod
     @db_query
     def get_by_id(cls, db: Session, user_id: int):
@@ -1,5 +1,7 @@
-from typing import Optional
+from typing import List, Optional
 
+from app.core.cache import cached
+from app.db.systemconfig_oper import SystemConfigOper
 from app.helper.service import ServiceBaseHelper
 from app.schemas import DownloaderConf, ServiceInfo
 from app.schemas.types import SystemConfigKey, ModuleType
@@ -35,3 +37,14 @@ class DownloaderHelper(ServiceBaseHelper[DownloaderConf]):
 
         # 判断服务类型是否为指定类型
         return bool(service and service.type == service_type)
+
+
+@cached(maxsize=1, ttl=30, skip_empty=True)
+def enabled_downloaders() -> List[dict]:
+    """
+    查询启用的下载器名称及类型，短时缓存，下载器配置变更时清理
+    """
+    downloaders: List[dict] = SystemConfigOper().get(SystemConfigKey.Downloaders)
+    if downloaders:
+        return [{"name": d.get("name"), "type": d.get("type")} for d in downloaders if d.get("enabled")]
+    return []
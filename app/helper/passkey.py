@@ -320,7 +320,8 @@ class PassKeyHelper:
         credential_public_key: str,
         credential_current_sign_count: int,
         expected_origin: Optional[str] = None,
-        expected_rp_id: Optional[str] = None
+        expected_rp_id: Optional[str] = None,
+        expected_user_id: Optional[int] = None
     ) -> Tuple[bool, int]:
         """
         验证认证响应
@@ -331,6 +332,7 @@ class PassKeyHelper:
         :param credential_current_sign_count: 当前签名计数
         :param expected_origin: 期望的源地址
         :param expected_rp_id: 期望的RP ID
+        :param expected_user_id: 凭证所属用户ID，客户端返回userHandle时需与之一致
         :return: (验证成功, 新的签名计数)
         """
         try:
@@ -343,6 +345,13 @@ class PassKeyHelper:
             # 构建AuthenticationCredential对象
             authentication_credential = parse_authentication_credential_json(json.dumps(credential))
 
+            # userHandle 与凭证所属用户不一致时直接拒绝，无需再验证签名
+            user_handle = authentication_credential.response.user_handle
+            if user_handle and expected_user_id is not None \
+                    and user_handle != str(expected_user_id).encode('utf-8'):
+                logger.warning("验证认证响应失败: userHandle 与凭证所属用户不匹配")
+                return False, credential_current_sign_count
+
             # 验证认证响应
             verification = verify_authentication_response(
                 credential=authentication_credential,
@@ -220,19 +220,21 @@ class RedisHelper(ConfigReloadMixin, metaclass=Singleton):
             logger.error(f"Failed to get key: {key} in region: {region}, error: {e}")
             return None
 
-    def delete(self, key: str, region: Optional[str] = "DEFAULT") -> None:
+    def delete(self, key: str, region: Optional[str] = "DEFAULT") -> bool:
         """
         删除缓存
 
         :param key: 缓存的键
         :param region: 缓存的区
+        :return: 是否删除了存在的键，Redis 的 DEL 为原子操作，并发删除同一键时只有一方返回 True
         """
         try:
             self._connect()
             redis_key = self.__make_redis_key(region, key)
-            self.client.delete(redis_key)
+            return bool(self.client.delete(redis_key))
         except Exception as e:
             logger.error(f"Failed to delete key: {key} in region: {region}, error: {e}")
+            return False
 
     def clear(self, region: Optional[str] = None) -> None:
         """
@@ -130,7 +130,7 @@ class SubscribeHelper(metaclass=WeakSingleton):
             return res.json()
         return []
 
-    @cached(region=_shares_cache_region, maxsize=5, ttl=1800, skip_empty=True)
+    @cached(region=_shares_cache_region, maxsize=32, ttl=1800, skip_empty=True)
     def get_statistic(self, stype: str, page: Optional[int] = 1, count: Optional[int] = 30,
                       genre_id: Optional[int] = None, min_rating: Optional[float] = None,
                       max_rating: Optional[float] = None, sort_type: Optional[str] = None) -> List[dict]:
@@ -161,7 +161,7 @@ class SubscribeHelper(metaclass=WeakSingleton):
 
         return self._handle_list_response(res)
 
-    @cached(region=_shares_cache_region, maxsize=5, ttl=1800, skip_empty=True)
+    @cached(region=_shares_cache_region, maxsize=32, ttl=1800, skip_empty=True)
     async def async_get_statistic(self, stype: str, page: Optional[int] = 1, count: Optional[int] = 30,
                                   genre_id: Optional[int] = None, min_rating: Optional[float] = None,
                                   max_rating: Optional[float] = None, sort_type: Optional[str] = None) -> List[dict]:
@@ -385,7 +385,7 @@ class SubscribeHelper(metaclass=WeakSingleton):
 
         return self._handle_response(res, clear_cache=False)
 
-    @cached(region=_shares_cache_region, maxsize=1, ttl=1800, skip_empty=True)
+    @cached(region=_shares_cache_region, maxsize=32, ttl=1800, skip_empty=True)
     def get_shares(self, name: Optional[str] = None, page: Optional[int] = 1, count: Optional[int] = 30,
                    genre_id: Optional[int] = None, min_rating: Optional[float] = None,
                    max_rating: Optional[float] = None, sort_type: Optional[str] = None) -> List[dict]:
@@ -416,7 +416,7 @@ class SubscribeHelper(metaclass=WeakSingleton):
 
         return self._handle_list_response(res)
 
-    @cached(region=_shares_cache_region, maxsize=1, ttl=1800, skip_empty=True)
+    @cached(region=_shares_cache_region, maxsize=32, ttl=1800, skip_empty=True)
     async def async_get_shares(self, name: Optional[str] = None, page: Optional[int] = 1, count: Optional[int] = 30,
                                genre_id: Optional[int] = None, min_rating: Optional[float] = None,
                                max_rating: Optional[float] = None, sort_type: Optional[str] = None) -> List[dict]:
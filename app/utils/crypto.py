@@ -3,6 +3,7 @@ import hashlib
 from hashlib import md5
 from typing import Union, Optional, Tuple
 
+import xxhash
 from Crypto import Random
 from Crypto.Cipher import AES
 from cryptography.hazmat.backends import default_backend
@@ -122,6 +123,19 @@ class HashUtils:
             data = data.encode(encoding)
         return hashlib.md5(data).digest()
 
+    @staticmethod
+    def xxh3(data: Union[str, bytes], encoding: str = "utf-8") -> str:
+        """
+        生成数据的XXH3 64位哈希值，并以字符串形式返回，适用于ETag等无安全要求的场景
+
+        :param data: 输入的数据，类型为字符串或字节
+        :param encoding: 字符串编码类型，默认使用UTF-8
+        :return: 生成的XXH3哈希字符串
+        """
+        if isinstance(data, str):
+            data = data.encode(encoding)
+        return xxhash.xxh3_64_hexdigest(data)
+
 
 class CryptoJsUtils:
 
@@ -16,10 +16,11 @@ class OtpUtils:
     @staticmethod
     def is_legal(otp_uri: str, password: str) -> bool:
         """
-        校验二次验证是否正确
+        校验二次验证是否正确，直接使用uri解析出的TOTP对象（保留其摘要算法和位数），
+        pyotp内部使用hmac.compare_digest比较验证码
         """
         try:
-            return pyotp.TOTP(pyotp.parse_uri(otp_uri).secret).verify(password)
+            return pyotp.parse_uri(otp_uri).verify(password)
         except Exception as err:
             print(str(err))
             return False
@@ -1,6 +1,7 @@
 import unittest
 
 from tests.test_bluray import BluRayTest
+from tests.test_mcp import McpJsonRpcTest
 from tests.test_metainfo import MetaInfoTest
 from tests.test_object import ObjectUtilsTest
 
@@ -22,6 +23,12 @@ if __name__ == '__main__':
     # 测试蓝光目录识别
     suite.addTest(BluRayTest())
 
+    # 测试MCP JSON-RPC批量请求及通知处理
+    suite.addTest(McpJsonRpcTest('test_empty_batch'))
+    suite.addTest(McpJsonRpcTest('test_notification_batch'))
+    suite.addTest(McpJsonRpcTest('test_mixed_batch'))
+    suite.addTest(McpJsonRpcTest('test_single_notification'))
+
     # 运行测试
     runner = unittest.TextTestRunner()
     runner.run(suite)
@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.endpoints import mcp
+from app.core.security import verify_apikey
+
+
+class McpJsonRpcTest(TestCase):
+
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(mcp.router, prefix="/mcp")
+        app.dependency_overrides[verify_apikey] = lambda: "test"
+        self.client = TestClient(app)
+
+    def test_empty_batch(self):
+        response = self.client.post("/mcp", json=[])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], -32600)
+
+    def test_notification_batch(self):
+        response = self.client.post("/mcp", json=[
+            {"jsonrpc": "2.0", "method": "notifications/cancelled"},
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        ])
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b"")
+
+    def test_mixed_batch(self):
+        response = self.client.post("/mcp", json=[
+            {"jsonrpc": "2.0", "id": 1, "method": "ping"},
+            {"jsonrpc": "2.0", "method": "ping"},
+            {"jsonrpc": "2.0", "method": "notifications/cancelled"},
+            {"jsonrpc": "2.0", "id": 2, "method": "unknown/method"},
+        ])
+        self.assertEqual(response.status_code, 200)
+        contents = response.json()
+        self.assertEqual([content["id"] for content in contents], [1, 2])
+        self.assertEqual(contents[0]["result"], {})
+        self.assertEqual(contents[1]["error"]["code"], -32601)
+
+    def test_single_notification(self):
+        response = self.client.post("/mcp", json={"jsonrpc": "2.0", "method": "ping"})
+        self.assertEqual(response.status_code, 204)
+        response = self.client.post("/mcp", json={"jsonrpc": "2.0", "method": "unknown/method"})
+        self.assertEqual(response.status_code, 204)